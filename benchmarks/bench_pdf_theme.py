@@ -0,0 +1,80 @@
+"""
+Micro-benchmark: per-page create_pdf time with and without a cached PDFTheme.
+
+"Before" rebuilds the theme for every page, which is what create_pdf used to
+do with getSampleStyleSheet() and its ParagraphStyle objects; "after" reuses
+the theme built once by the scraper.
+
+Usage: python benchmarks/bench_pdf_theme.py [pages]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_theme import PDFTheme  # noqa: E402
+from scrapper import PDFWebScraper  # noqa: E402
+
+
+def sample_page(paragraphs=20, links=30):
+    blocks = []
+    for i in range(paragraphs):
+        blocks.append({"type": "heading", "level": i % 6 + 1, "text": f"Sección {i}"})
+        blocks.append({"type": "paragraph", "text": "Lorem ipsum dolor sit amet. " * 8})
+    return {
+        "url": "https://example.com/docs/page",
+        "title": "Página de ejemplo",
+        "headings": [b for b in blocks if b["type"] == "heading"],
+        "paragraphs": [b["text"] for b in blocks if b["type"] == "paragraph"],
+        "blocks": blocks,
+        "links": [
+            {"text": f"Enlace {i}", "url": f"https://example.com/{i}"}
+            for i in range(links)
+        ],
+        "child_urls": [],
+    }
+
+
+def run(scraper, data, pages, fresh_theme):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(pages):
+            if fresh_theme:
+                scraper.theme = PDFTheme()
+            scraper.create_pdf(data, f"bench{i % 10}.pdf")
+    return (time.perf_counter() - start) / pages
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    data = sample_page()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = PDFWebScraper(delay=0, respect_robots=False)
+        scraper.output_dir = tmp
+
+        # Warm up fonts and caches
+        run(scraper, data, 5, fresh_theme=False)
+
+        before = run(scraper, data, pages, fresh_theme=True)
+        after = run(scraper, data, pages, fresh_theme=False)
+
+        start = time.perf_counter()
+        for _ in range(pages):
+            PDFTheme()
+        theme_cost = (time.perf_counter() - start) / pages
+
+    print(f"Pages rendered per run: {pages}")
+    print(f"Theme construction:     {theme_cost * 1000:.3f} ms/page")
+    print(f"Before (theme per page): {before * 1000:.2f} ms/page")
+    print(f"After (cached theme):    {after * 1000:.2f} ms/page")
+    print(f"Saved:                   {(before - after) / before * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
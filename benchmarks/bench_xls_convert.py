@@ -0,0 +1,130 @@
+"""
+Benchmark: XLS -> XLSX conversion, pandas path vs streaming path.
+
+"Before" is the original convert_xls_to_xlsx: every sheet read into a
+DataFrame with pd.read_excel and written through a normal openpyxl
+workbook. "After" is xlsx_processor.convert_xls_file (xlrd on demand +
+openpyxl write_only). Each run happens in a fresh process so peak RSS is
+not shared between them.
+
+Usage: python benchmarks/bench_xls_convert.py [sheets] [rows] [cols]
+"""
+
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import make_xls  # noqa: E402
+
+
+def convert_pandas(path):
+    import pandas as pd
+
+    xls_file = pd.ExcelFile(path, engine="xlrd")
+    xlsx_buffer = io.BytesIO()
+    with pd.ExcelWriter(xlsx_buffer, engine="openpyxl", mode="w") as writer:
+        for sheet_name in xls_file.sheet_names:
+            df = pd.read_excel(xls_file, sheet_name=sheet_name, header=None)
+            df.to_excel(writer, sheet_name=sheet_name, index=False, header=False)
+    return len(xlsx_buffer.getvalue())
+
+
+def convert_streaming(path):
+    from xlsx_processor import convert_xls_file
+
+    with tempfile.TemporaryFile() as output:
+        convert_xls_file(path, output)
+        return output.tell()
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def current_rss_mb():
+    # VmRSS is Linux only; elsewhere fall back to the peak so far
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def run_child(mode, path):
+    # Import each path's libraries first so the delta only covers conversion
+    if mode == "before":
+        import pandas  # noqa: F401
+    else:
+        import xlsx_processor  # noqa: F401
+
+    baseline = current_rss_mb()
+    start = time.perf_counter()
+    size = (convert_pandas if mode == "before" else convert_streaming)(path)
+    elapsed = time.perf_counter() - start
+    print(
+        json.dumps(
+            {
+                "seconds": elapsed,
+                "peak_rss_mb": peak_rss_mb(),
+                "delta_rss_mb": peak_rss_mb() - baseline,
+                "bytes": size,
+            }
+        )
+    )
+
+
+def main():
+    sheets = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    cols = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.xls")
+        make_xls(path, sheets, rows, cols)
+        print(
+            f"Workbook: {sheets} sheets x {rows} rows x {cols} cols "
+            f"({os.path.getsize(path) / 1024 / 1024:.1f} MB XLS)"
+        )
+
+        results = {}
+        for mode in ("before", "after"):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", mode, path],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            results[mode] = json.loads(output)
+
+    for mode, label in (("before", "Before (pandas)"), ("after", "After (streaming)")):
+        r = results[mode]
+        print(
+            f"{label:<18} {r['seconds']:7.2f} s  peak RSS {r['peak_rss_mb']:7.1f} MB "
+            f"(+{r['delta_rss_mb']:.1f} MB during conversion)"
+        )
+    before, after = results["before"], results["after"]
+    print(
+        f"Speed-up: {before['seconds'] / after['seconds']:.2f}x, "
+        f"conversion memory: {before['delta_rss_mb']:.1f} -> "
+        f"{after['delta_rss_mb']:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], sys.argv[3])
+    else:
+        main()
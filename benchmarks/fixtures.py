@@ -0,0 +1,151 @@
+"""
+Offline fixtures for the benchmarks: a synthetic website served locally and
+generated PPTX / XLS files.
+
+Everything is seeded, so the same parameters always produce the same site
+and documents.
+"""
+
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua enim ad minim veniam "
+    "quis nostrud exercitation ullamco laboris nisi aliquip ex ea commodo"
+).split()
+
+
+def _sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def site_depth(pages, fanout):
+    """Crawl depth needed to reach every page of a generated site."""
+    depth, reachable, level = 1, 1, 1
+    while reachable < pages:
+        level *= fanout
+        reachable += level
+        depth += 1
+    return depth
+
+
+def make_site(directory, pages=200, fanout=5, dom_size=40, seed=0):
+    """
+    Writes a synthetic site: page i links to its `fanout` children in a
+    tree (i * fanout + 1 ...), back to the root and to its parent, with
+    `dom_size` headings and paragraphs in nested markup.
+
+    Returns:
+        str: Path of the root page relative to `directory`
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    for i in range(pages):
+        body = []
+        for j in range(dom_size):
+            if j % 5 == 0:
+                body.append(f"<h{j % 3 + 2}>Section {i}.{j}</h{j % 3 + 2}>")
+            body.append(
+                f'<div class="c"><section><p>{_sentence(rng, 20 + j % 15)}</p>'
+                f"</section></div>"
+            )
+
+        links = [f"p{c}.html" for c in range(i * fanout + 1, i * fanout + fanout + 1)]
+        links = [link for link in links if int(link[1:-5]) < pages]
+        links += ["p0.html", f"p{(i - 1) // fanout if i else 0}.html"]
+        nav = "".join(f'<li><a href="{link}">{link}</a></li>' for link in links)
+
+        with open(os.path.join(directory, f"p{i}.html"), "w", encoding="utf-8") as f:
+            f.write(
+                f"<!DOCTYPE html><html><head><title>Page {i}</title></head>"
+                f"<body><nav><ul>{nav}</ul></nav><main><h1>Page {i}</h1>"
+                f"{''.join(body)}</main></body></html>"
+            )
+    return "p0.html"
+
+
+def make_pptx(path, slides=20, seed=0):
+    """Writes a deck with titles, wrapped body text, a table and notes."""
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    rng = random.Random(seed)
+    presentation = Presentation()
+    for s in range(slides):
+        slide = presentation.slides.add_slide(presentation.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {s}"
+        body = slide.placeholders[1].text_frame
+        body.text = _sentence(rng, 30)
+        for _ in range(4):
+            body.add_paragraph().text = _sentence(rng, 15)
+        if s % 3 == 0:
+            table = slide.shapes.add_table(
+                4, 3, Inches(1), Inches(5), Inches(6), Inches(1.5)
+            ).table
+            for r in range(4):
+                for c in range(3):
+                    table.cell(r, c).text = f"{rng.choice(WORDS)} {r}{c}"
+        slide.notes_slide.notes_text_frame.text = _sentence(rng, 25)
+    presentation.save(path)
+
+
+def make_xls(path, sheets=4, rows=5000, cols=8):
+    """Writes an XLS with ints, text, dates, floats and a merged header."""
+    import xlwt
+
+    date_style = xlwt.easyxf(num_format_str="YYYY-MM-DD")
+    book = xlwt.Workbook()
+    start = datetime(2020, 1, 1)
+    for s in range(sheets):
+        sheet = book.add_sheet(f"Hoja{s}")
+        sheet.write_merge(0, 0, 0, 2, f"Cabecera {s}")
+        for r in range(1, rows):
+            for c in range(cols):
+                kind = c % 4
+                if kind == 0:
+                    sheet.write(r, c, r * c)
+                elif kind == 1:
+                    sheet.write(r, c, f"texto {r}-{c}")
+                elif kind == 2:
+                    sheet.write(r, c, start + timedelta(days=r), date_style)
+                else:
+                    sheet.write(r, c, r / 7)
+    book.save(path)
+
+
+class FixtureServer:
+    """
+    Serves a directory on 127.0.0.1 from a background thread, adding a
+    fixed latency to every response to mimic a remote server.
+    """
+
+    def __init__(self, directory, latency=0.0):
+        class Handler(SimpleHTTPRequestHandler):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, directory=directory, **kwargs)
+
+            def send_head(self):
+                if latency:
+                    time.sleep(latency)
+                return super().send_head()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,329 @@
+"""
+Benchmark suite for the scraper and the converters, fully offline.
+
+A synthetic site (see fixtures.make_site) and synthetic PPTX / XLS files are
+generated in a temporary directory and served from 127.0.0.1 with an
+optional per-request latency. Each component then runs in a fresh process
+so its peak RSS is its own:
+
+    crawl_sync    PDFWebScraper.scrape_recursive over the whole site
+    crawl_async   PDFWebScraper.scrape_recursive_async over the whole site
+    pdf_render    PDFWebScraper.create_pdf for every page of the site
+    pptx          pptx_url_to_pdf_bytes for every deck
+    xls           convert_xls_to_xlsx for every workbook
+
+For each one it reports throughput, p50/p99 latency per item and peak RSS,
+and compares them with a stored baseline when one exists.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--pages N] [--fanout N] ...
+    python benchmarks/run_benchmarks.py --save-baseline
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import fixtures  # noqa: E402
+
+COMPONENTS = ("crawl_sync", "crawl_async", "pdf_render", "pptx", "xls")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+# Metrics where a higher value is better; for the rest lower is better
+HIGHER_IS_BETTER = ("throughput",)
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(q * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _timed(function, samples):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - start)
+
+    return wrapper
+
+
+def _scraper(output_dir, **kwargs):
+    from scrapper import PDFWebScraper
+
+    scraper = PDFWebScraper(delay=0, respect_robots=False, **kwargs)
+    scraper.output_dir = output_dir
+    return scraper
+
+
+def bench_crawl_sync(params, work_dir):
+    samples = []
+    scraper = _scraper(work_dir)
+    scraper._fetch_page = _timed(scraper._fetch_page, samples)
+    scraper.scrape_recursive(params["site_url"], params["depth"], 0, "1")
+    return samples, None
+
+
+def bench_crawl_async(params, work_dir):
+    samples = []
+    scraper = _scraper(work_dir, concurrency=params["concurrency"])
+    scraper._fetch_page = _timed(scraper._fetch_page, samples)
+    asyncio.run(
+        scraper.scrape_recursive_async(
+            params["site_url"], params["depth"], parent_index="1"
+        )
+    )
+    return samples, None
+
+
+def bench_pdf_render(params, work_dir):
+    # Fetch every page first (not timed), then time rendering alone
+    scraper = _scraper(work_dir, render_pdf=False)
+    pages = []
+    scraper._emit = lambda data, index, depth: pages.append((data, index))
+    scraper.scrape_recursive(params["site_url"], params["depth"], 0, "1")
+
+    samples = []
+    for data, index in pages:
+        start = time.perf_counter()
+        scraper.create_pdf(data, f"web{index}.pdf")
+        samples.append(time.perf_counter() - start)
+    return samples, None
+
+
+def bench_pptx(params, work_dir):
+    from pptx_to_pdf import pptx_url_to_pdf_bytes
+
+    samples = []
+    total_bytes = 0
+    for url, size in params["decks"]:
+        start = time.perf_counter()
+        pptx_url_to_pdf_bytes(url)
+        samples.append(time.perf_counter() - start)
+        total_bytes += size
+    return samples, total_bytes
+
+
+def bench_xls(params, work_dir):
+    from xlsx_processor import convert_xls_to_xlsx
+
+    samples = []
+    total_bytes = 0
+    for path in params["workbooks"]:
+        with open(path, "rb") as f:
+            content = f.read()
+        start = time.perf_counter()
+        convert_xls_to_xlsx(content)
+        samples.append(time.perf_counter() - start)
+        total_bytes += len(content)
+    return samples, total_bytes
+
+
+def run_child(component, params_json):
+    params = json.loads(params_json)
+    bench = globals()[f"bench_{component}"]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            samples, total_bytes = bench(params, work_dir)
+        elapsed = time.perf_counter() - start
+
+    result = {
+        "items": len(samples),
+        "seconds": round(elapsed, 4),
+        "throughput": round(len(samples) / elapsed, 3) if elapsed > 0 else 0.0,
+        "p50": round(percentile(samples, 0.5), 6),
+        "p99": round(percentile(samples, 0.99), 6),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+    if total_bytes is not None:
+        result["mb_per_second"] = round(total_bytes / 1024 / 1024 / elapsed, 3)
+    print(json.dumps(result))
+
+
+def run_component(component, params):
+    """Runs one component in a fresh process and returns its results."""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", component]
+        + [json.dumps(params)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance):
+    """
+    Prints each metric next to its baseline and returns the regressions.
+
+    Returns:
+        list: (component, metric, baseline, current) beyond the tolerance
+    """
+    regressions = []
+    print(f"\n{'component':<12} {'metric':<12} {'baseline':>12} {'current':>12} change")
+    for component, result in results.items():
+        before = baseline.get(component)
+        if not before:
+            continue
+        for metric in ("throughput", "p50", "p99", "peak_rss_mb"):
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            flag = "  ⚠️ regression" if worse > tolerance else ""
+            if flag:
+                regressions.append((component, metric, old, new))
+            print(
+                f"{component:<12} {metric:<12} {old:>12.4f} {new:>12.4f} "
+                f"{change * 100:+6.1f}%{flag}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite")
+    parser.add_argument("--pages", type=int, default=150, help="Pages in the site")
+    parser.add_argument("--fanout", type=int, default=5, help="Links per page")
+    parser.add_argument("--dom-size", type=int, default=40, help="Paragraphs per page")
+    parser.add_argument(
+        "--latency-ms", type=float, default=5.0, help="Added latency per request"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Workers for crawl_async"
+    )
+    parser.add_argument("--decks", type=int, default=10, help="PPTX files")
+    parser.add_argument("--slides", type=int, default=30, help="Slides per deck")
+    parser.add_argument("--workbooks", type=int, default=2, help="XLS files")
+    parser.add_argument("--xls-sheets", type=int, default=4, help="Sheets per XLS")
+    parser.add_argument("--xls-rows", type=int, default=5000, help="Rows per sheet")
+    parser.add_argument(
+        "--only", default=",".join(COMPONENTS), help="Components to run"
+    )
+    parser.add_argument(
+        "--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file"
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store these results as the new baseline",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="Relative change counted as a regression (default 0.10)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Runs per component; the median run is reported",
+    )
+    parser.add_argument(
+        "--output", default=None, help="Also write the results to this JSON file"
+    )
+    args = parser.parse_args()
+    components = [c.strip() for c in args.only.split(",") if c.strip()]
+
+    with tempfile.TemporaryDirectory(prefix="bench_") as root:
+        site_dir = os.path.join(root, "site")
+        fixtures.make_site(site_dir, args.pages, args.fanout, args.dom_size)
+
+        decks = []
+        if "pptx" in components:
+            for i in range(args.decks):
+                path = os.path.join(site_dir, f"deck{i}.pptx")
+                fixtures.make_pptx(path, args.slides, seed=i)
+                decks.append((f"deck{i}.pptx", os.path.getsize(path)))
+
+        workbooks = []
+        if "xls" in components:
+            for i in range(args.workbooks):
+                path = os.path.join(root, f"book{i}.xls")
+                fixtures.make_xls(path, args.xls_sheets, args.xls_rows)
+                workbooks.append(path)
+
+        results = {}
+        with fixtures.FixtureServer(site_dir, args.latency_ms / 1000) as server:
+            params = {
+                "site_url": f"{server.url}/p0.html",
+                "depth": fixtures.site_depth(args.pages, args.fanout),
+                "concurrency": args.concurrency,
+                "decks": [(f"{server.url}/{name}", size) for name, size in decks],
+                "workbooks": workbooks,
+            }
+            for component in components:
+                runs = [run_component(component, params) for _ in range(args.repeat)]
+                # Keep the median run by throughput to damp noisy outliers
+                runs.sort(key=lambda r: r["throughput"])
+                results[component] = runs[len(runs) // 2]
+
+    print(
+        f"Site: {args.pages} pages, fan-out {args.fanout}, {args.dom_size} "
+        f"paragraphs/page, {args.latency_ms:g} ms latency"
+    )
+    print(
+        f"\n{'component':<12} {'items':>6} {'items/s':>9} {'p50 ms':>8} "
+        f"{'p99 ms':>8} {'RSS MB':>8} {'MB/s':>7}"
+    )
+    for component, r in results.items():
+        mb = f"{r['mb_per_second']:7.2f}" if "mb_per_second" in r else f"{'-':>7}"
+        print(
+            f"{component:<12} {r['items']:>6} {r['throughput']:>9.2f} "
+            f"{r['p50'] * 1000:>8.1f} {r['p99'] * 1000:>8.1f} "
+            f"{r['peak_rss_mb']:>8.1f} {mb}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline first")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    print(f"\n{len(regressions)} regression(s) beyond {args.tolerance * 100:.0f}%")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], sys.argv[3])
+    else:
+        sys.exit(main())
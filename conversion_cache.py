@@ -0,0 +1,328 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import http_client
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class ConversionCache:
+    """
+    Content-addressed on-disk cache for document conversions (PPTX -> PDF,
+    XLS -> XLSX).
+
+    Converted files are stored under a key built from the converter name,
+    its version and the SHA-256 of the downloaded bytes, so the same
+    document reached through different URLs is converted once, and bumping
+    the converter version invalidates old output. Each URL also remembers
+    the ETag / Last-Modified of its last download, so an unchanged document
+    is answered by a 304 without downloading or converting anything.
+
+    The index is a SQLite database in WAL mode and artifacts are written to
+    a temporary file and renamed into place, so several processes can share
+    one cache directory. Artifacts are evicted least-recently-used first
+    once their total size exceeds max_bytes. Hit and miss counts are kept
+    both for this instance and, aggregated over all processes, in the index.
+    """
+
+    def __init__(
+        self, path="outputs/.conversion_cache", max_bytes=1024 * 1024 * 1024, max_age=0
+    ):
+        """
+        Opens (or creates) the cache directory.
+
+        Args:
+            path: Directory holding the index and the converted files
+            max_bytes: Size cap for the stored artifacts, in bytes
+            max_age: Seconds during which a cached URL is served without
+                revalidating it with the server (0 always revalidates)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(path, "objects"), exist_ok=True)
+
+        self._conn = sqlite3.connect(
+            os.path.join(path, "index.sqlite"),
+            timeout=60,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS artifacts (
+                key TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS artifacts_lru ON artifacts (last_used);
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT NOT NULL,
+                converter TEXT NOT NULL,
+                key TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                checked REAL NOT NULL,
+                PRIMARY KEY (url, converter)
+            );
+            CREATE TABLE IF NOT EXISTS stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            """
+        )
+
+    def _object_path(self, key):
+        return os.path.join(self.path, "objects", key[:2], key)
+
+    def _execute(self, *statements):
+        """Runs (sql, params) pairs in one write transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, params in statements:
+                    self._conn.execute(sql, params)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _count(self, name):
+        return (
+            "INSERT INTO stats VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    def _open_artifact(self, key):
+        """
+        Opens a stored artifact and marks it as used.
+
+        The file stays readable through the returned handle even if another
+        process evicts it afterwards.
+
+        Returns:
+            file: Binary file object, or None if the artifact is gone
+        """
+        try:
+            f = open(self._object_path(key), "rb")
+        except FileNotFoundError:
+            return None
+        self._execute(
+            ("UPDATE artifacts SET last_used = ? WHERE key = ?", (time.time(), key)),
+        )
+        return f
+
+    def _hit(self, *statements):
+        self._execute(self._count("hits"), *statements)
+        with self._lock:
+            self.hits += 1
+
+    def open(self, url, converter, version, convert, session=None):
+        """
+        Returns the converted document for a URL, converting it if needed.
+
+        Args:
+            url: URL of the source document
+            converter: Converter name (e.g. "pptx_to_pdf")
+            version: Converter version; changing it invalidates old output
+            convert: Function convert(source, output_path, response) writing
+                the converted file. source is a seekable binary file with
+                the download and response the requests.Response
+            session: requests.Session to download with (defaults to the
+                shared session from http_client)
+
+        Returns:
+            file: Open binary file with the converted document (the caller
+                must close it)
+        """
+        converter = f"{converter}@{version}"
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, etag, last_modified, checked FROM urls "
+                "WHERE url = ? AND converter = ?",
+                (url, converter),
+            ).fetchone()
+
+        headers = {}
+        if row:
+            key, etag, last_modified, checked = row
+            if self.max_age and time.time() - checked < self.max_age:
+                f = self._open_artifact(key)
+                if f is not None:
+                    self._hit()
+                    return f
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        session = session or http_client.get_session()
+        response = session.get(
+            url, headers=headers, stream=True, timeout=http_client.DEFAULT_TIMEOUT
+        )
+        if response.status_code == 304 and row:
+            response.close()
+            f = self._open_artifact(row[0])
+            if f is not None:
+                self._hit(
+                    (
+                        "UPDATE urls SET checked = ? WHERE url = ? AND converter = ?",
+                        (time.time(), url, converter),
+                    )
+                )
+                return f
+            # The artifact was evicted: download it again
+            response = session.get(
+                url, stream=True, timeout=http_client.DEFAULT_TIMEOUT
+            )
+
+        with response, tempfile.SpooledTemporaryFile(
+            max_size=16 * 1024 * 1024
+        ) as source:
+            response.raise_for_status()
+            digest = hashlib.sha256()
+            for chunk in response.iter_content(CHUNK_SIZE):
+                digest.update(chunk)
+                source.write(chunk)
+            source.seek(0)
+
+            key = hashlib.sha256(
+                f"{converter}:{digest.hexdigest()}".encode("utf-8")
+            ).hexdigest()
+            url_row = (
+                "INSERT OR REPLACE INTO urls VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    converter,
+                    key,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    time.time(),
+                ),
+            )
+
+            # Same bytes already converted (another URL, or no validators)
+            f = self._open_artifact(key)
+            if f is not None:
+                self._hit(url_row)
+                return f
+
+            return self._store(key, source, response, convert, url_row)
+
+    def _store(self, key, source, response, convert, url_row):
+        """Converts a download into the cache and opens the result."""
+        path = self._object_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        os.close(fd)
+        try:
+            convert(source, temp_path, response)
+            f = open(temp_path, "rb")
+            size = os.path.getsize(temp_path)
+            os.replace(temp_path, path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+        self._execute(
+            (
+                "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?)",
+                (key, size, time.time()),
+            ),
+            url_row,
+            self._count("misses"),
+        )
+        with self._lock:
+            self.misses += 1
+        self._evict()
+        return f
+
+    def _evict(self):
+        """Drops least-recently-used artifacts until under max_bytes."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                total = self._conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM artifacts"
+                ).fetchone()[0]
+                removed = []
+                while total > self.max_bytes:
+                    rows = self._conn.execute(
+                        "SELECT key, size FROM artifacts ORDER BY last_used LIMIT 64"
+                    ).fetchall()
+                    if not rows:
+                        break
+                    for key, size in rows:
+                        self._conn.execute(
+                            "DELETE FROM artifacts WHERE key = ?", (key,)
+                        )
+                        self._conn.execute("DELETE FROM urls WHERE key = ?", (key,))
+                        removed.append(key)
+                        total -= size
+                        if total <= self.max_bytes:
+                            break
+                if removed:
+                    self._conn.execute(
+                        "INSERT INTO stats VALUES ('evictions', ?) "
+                        "ON CONFLICT(name) DO UPDATE SET value = value + ?",
+                        (len(removed), len(removed)),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        for key in removed:
+            try:
+                os.remove(self._object_path(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        """
+        Returns the counters aggregated over every process using the cache.
+
+        Returns:
+            dict: hits, misses, evictions, hit_rate, entries and bytes
+        """
+        with self._lock:
+            counters = dict(self._conn.execute("SELECT name, value FROM stats"))
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifacts"
+            ).fetchone()
+
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "evictions": counters.get("evictions", 0),
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def report(self):
+        """Prints hit/miss counts for this process and for the whole cache."""
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        stats = self.stats()
+        print(
+            f"🗄️  Conversion cache: {self.hits} hits, {self.misses} misses "
+            f"({rate:.0f}% hit rate) in this run; "
+            f"{stats['hit_rate'] * 100:.0f}% overall, {stats['evictions']} "
+            f"evictions, {stats['entries']} files, {stats['bytes'] / 1024:.0f} KB stored"
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,136 @@
+import os
+import sqlite3
+import tempfile
+from collections import deque
+
+
+class CrawlFrontier:
+    """
+    Deduplicated FIFO frontier for breadth-first crawls.
+
+    Entries are (url, depth, index) tuples. Up to memory_limit entries and
+    seen URLs are kept in memory; beyond that both spill to a SQLite file, so
+    a crawl of any size runs in bounded RAM. FIFO order is preserved across
+    the spill.
+    """
+
+    def __init__(self, memory_limit=10000, spill_path=None, max_per_depth=None):
+        """
+        Args:
+            memory_limit: Maximum queued entries (and seen URLs) held in memory
+            spill_path: SQLite file used once the limit is exceeded
+                (a temporary file by default)
+            max_per_depth: Maximum URLs accepted per depth level, or None
+        """
+        self.memory_limit = memory_limit
+        self.max_per_depth = max_per_depth
+        self._spill_path = spill_path
+        self._owns_spill_file = spill_path is None
+        self._queue = deque()
+        self._seen = set()
+        self._per_depth = {}
+        self._conn = None
+        self._spilled = 0
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def push(self, url, depth, index):
+        """
+        Queues a URL unless it was already seen or its depth is full.
+
+        Returns:
+            bool: True if the URL was queued
+        """
+        if self.max_per_depth is not None:
+            if self._per_depth.get(depth, 0) >= self.max_per_depth:
+                return False
+
+        if not self.mark_seen(url):
+            return False
+
+        self._per_depth[depth] = self._per_depth.get(depth, 0) + 1
+        self._length += 1
+
+        # Once entries are on disk, new ones must follow them to keep FIFO
+        if self._spilled or len(self._queue) >= self.memory_limit:
+            self._connect().execute(
+                "INSERT INTO queue (url, depth, idx) VALUES (?, ?, ?)",
+                (url, depth, index),
+            )
+            self._spilled += 1
+        else:
+            self._queue.append((url, depth, index))
+        return True
+
+    def pop(self):
+        """
+        Returns the oldest queued entry.
+
+        Returns:
+            tuple: (url, depth, index), or None if the frontier is empty
+        """
+        if not self._queue and self._spilled:
+            self._refill()
+        if not self._queue:
+            return None
+
+        self._length -= 1
+        return self._queue.popleft()
+
+    def mark_seen(self, url):
+        """
+        Records a URL as seen.
+
+        Returns:
+            bool: True if the URL had not been seen before
+        """
+        if url in self._seen:
+            return False
+
+        if self._conn is not None or len(self._seen) >= self.memory_limit:
+            cursor = self._connect().execute(
+                "INSERT OR IGNORE INTO seen (url) VALUES (?)", (url,)
+            )
+            return cursor.rowcount == 1
+
+        self._seen.add(url)
+        return True
+
+    def _refill(self):
+        """Moves the next batch of spilled entries back into memory."""
+        rows = self._conn.execute(
+            "SELECT id, url, depth, idx FROM queue ORDER BY id LIMIT ?",
+            (self.memory_limit,),
+        ).fetchall()
+        if rows:
+            self._conn.execute("DELETE FROM queue WHERE id <= ?", (rows[-1][0],))
+            self._spilled -= len(rows)
+        self._queue.extend((url, depth, idx) for _, url, depth, idx in rows)
+
+    def _connect(self):
+        """Opens the spill database on first use."""
+        if self._conn is None:
+            if self._spill_path is None:
+                fd, self._spill_path = tempfile.mkstemp(
+                    prefix="frontier_", suffix=".sqlite"
+                )
+                os.close(fd)
+            self._conn = sqlite3.connect(self._spill_path)
+            self._conn.execute("PRAGMA journal_mode=OFF")
+            self._conn.execute("PRAGMA synchronous=OFF")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS queue "
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT, depth INTEGER, idx TEXT)"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS seen (url TEXT PRIMARY KEY)")
+        return self._conn
+
+    def close(self):
+        """Closes and, if temporary, deletes the spill database."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+            if self._owns_spill_file and os.path.exists(self._spill_path):
+                os.remove(self._spill_path)
@@ -0,0 +1,191 @@
+import sqlite3
+import threading
+import time
+
+
+def _index_key(index):
+    """Sort key giving depth-first order for "1-2-10" style indexes."""
+    return [int(part) for part in index.split("-") if part.isdigit()]
+
+
+class CrawlState:
+    """
+    Persistent crawl state so an interrupted scrape_all can be resumed.
+
+    For every configuration (identified by its root index, e.g. "1") the
+    store keeps the completed pages with their output filename, which also
+    acts as the visited set, and the pending pages that were scheduled but
+    not processed yet. Writes are buffered and committed in batches (every
+    batch_size operations or flush_interval seconds), so a crash loses at
+    most the last batch: those pages are simply fetched again on resume.
+    """
+
+    def __init__(
+        self, path="webs/.crawl_state.sqlite", batch_size=200, flush_interval=2.0
+    ):
+        """
+        Args:
+            path: SQLite file holding the crawl state
+            batch_size: Buffered operations that trigger a commit
+            flush_interval: Seconds after which buffered operations are
+                committed regardless of batch_size
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending_ops = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS configs (
+                root TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                done INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                root TEXT NOT NULL,
+                url TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                PRIMARY KEY (root, url)
+            );
+            CREATE TABLE IF NOT EXISTS pending (
+                root TEXT NOT NULL,
+                idx TEXT NOT NULL,
+                url TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                PRIMARY KEY (root, idx)
+            );
+            """)
+        self._conn.commit()
+
+    def start_config(self, root, url, resume):
+        """
+        Prepares the state for a configuration.
+
+        When resuming an unfinished configuration for the same URL, its
+        stored pending pages are returned. Otherwise the configuration is
+        reset and only the root page is pending.
+
+        Args:
+            root: Root index of the configuration (e.g. "1")
+            url: Root URL of the configuration
+            resume: Whether to continue from the stored state
+
+        Returns:
+            list: Pending (index, url, depth) entries in depth-first order
+        """
+        self.flush()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url FROM configs WHERE root = ?", (root,)
+            ).fetchone()
+            if resume and row and row[0] == url:
+                rows = self._conn.execute(
+                    "SELECT idx, url, depth FROM pending WHERE root = ?", (root,)
+                ).fetchall()
+                return sorted(rows, key=lambda entry: _index_key(entry[0]))
+
+            self._conn.execute("DELETE FROM pages WHERE root = ?", (root,))
+            self._conn.execute("DELETE FROM pending WHERE root = ?", (root,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO configs (root, url, done) VALUES (?, ?, 0)",
+                (root, url),
+            )
+            self._conn.execute(
+                "INSERT INTO pending (root, idx, url, depth) VALUES (?, ?, ?, 0)",
+                (root, root, url),
+            )
+            self._conn.commit()
+        return [(root, url, 0)]
+
+    def is_done(self, root, url):
+        """Returns True if the configuration was fully crawled for this URL."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, done FROM configs WHERE root = ?", (root,)
+            ).fetchone()
+        return bool(row and row[0] == url and row[1])
+
+    def visited(self, root):
+        """Returns the set of URLs completed for a configuration."""
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM pages WHERE root = ?", (root,)
+            ).fetchall()
+        return {url for (url,) in rows}
+
+    def output_file(self, root, url):
+        """Returns the PDF filename written for a URL, or None."""
+        self.flush()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT filename FROM pages WHERE root = ? AND url = ?", (root, url)
+            ).fetchone()
+        return row[0] if row else None
+
+    def complete(self, index, url, filename, children=()):
+        """
+        Records a processed page and schedules its children.
+
+        Args:
+            index: Index of the page (e.g. "1-2")
+            url: Page URL
+            filename: Output filename written for the page
+            children: (index, url, depth) entries to mark as pending
+        """
+        root = index.split("-")[0]
+        ops = [
+            ("DELETE FROM pending WHERE root = ? AND idx = ?", (root, index)),
+            (
+                "INSERT OR REPLACE INTO pages (root, url, filename) VALUES (?, ?, ?)",
+                (root, url, filename),
+            ),
+        ]
+        ops.extend(
+            (
+                "INSERT OR REPLACE INTO pending (root, idx, url, depth) VALUES (?, ?, ?, ?)",
+                (root, child_index, child_url, depth),
+            )
+            for child_index, child_url, depth in children
+        )
+        self._buffer(ops)
+
+    def discard(self, index):
+        """Drops a pending page that turned out not to need processing."""
+        root = index.split("-")[0]
+        self._buffer(
+            [("DELETE FROM pending WHERE root = ? AND idx = ?", (root, index))]
+        )
+
+    def finish_config(self, root):
+        """Marks a configuration as fully crawled."""
+        self._buffer([("UPDATE configs SET done = 1 WHERE root = ?", (root,))])
+        self.flush()
+
+    def _buffer(self, ops):
+        with self._lock:
+            self._pending_ops.extend(ops)
+            due = (
+                len(self._pending_ops) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Commits all buffered operations in a single transaction."""
+        with self._lock:
+            if self._pending_ops:
+                with self._conn:
+                    for sql, params in self._pending_ops:
+                        self._conn.execute(sql, params)
+                self._pending_ops = []
+            self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,156 @@
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that never change page content
+TRACKING_PARAMS = ("utm_", "gclid", "fbclid", "mc_cid", "mc_eid", "ref_src")
+
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def canonicalize_url(url, drop_query=False):
+    """
+    Normalizes a URL so trivially different spellings compare equal.
+
+    Lowercases scheme and host, drops default ports, fragments, tracking
+    parameters and trailing slashes (except the root path), and sorts the
+    query string.
+
+    Args:
+        url: URL to normalize
+        drop_query: Remove the query string entirely
+
+    Returns:
+        str: Canonical URL
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and str(parts.port) != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    if parts.username:
+        host = f"{parts.username}@{host}"
+
+    path = re.sub(r"/{2,}", "/", parts.path) or "/"
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/")
+
+    query = ""
+    if not drop_query and parts.query:
+        params = [
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith(TRACKING_PARAMS)
+        ]
+        query = urlencode(sorted(params))
+
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def simhash(text, bits=64):
+    """
+    Computes the SimHash of a text over word 3-shingles.
+
+    Returns:
+        int: Fingerprint where near-identical texts differ in few bits
+    """
+    words = _WORD_RE.findall(text.lower())
+    shingles = [" ".join(words[i : i + 3]) for i in range(max(1, len(words) - 2))]
+
+    weights = [0] * bits
+    for shingle in shingles:
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=bits // 8)
+        value = int.from_bytes(digest.digest(), "big")
+        for bit in range(bits):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit in range(bits):
+        if weights[bit] > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class ContentDeduplicator:
+    """
+    Detects pages whose extracted text was already seen in the crawl.
+
+    Exact duplicates are found by a SHA-256 of the normalized text; near
+    duplicates by SimHash within max_distance bits. The 64-bit fingerprint
+    is split into max_distance + 1 bands, so any fingerprint within the
+    distance shares at least one band and only those candidates are
+    compared.
+    """
+
+    def __init__(self, max_distance=3, min_words=20, drop_query=False):
+        """
+        Args:
+            max_distance: Hamming distance up to which pages are near
+                duplicates (0 disables near-duplicate detection)
+            min_words: Pages with fewer words are only checked for exact
+                duplicates, since SimHash is unreliable on short texts
+            drop_query: Passed to canonicalize_url
+        """
+        self.max_distance = max_distance
+        self.min_words = min_words
+        self.drop_query = drop_query
+        self.duplicates = {}
+        self._exact = {}
+        self._bands = [{} for _ in range(max_distance + 1)]
+        self._band_bits = 64 // (max_distance + 1)
+
+    def canonicalize(self, url):
+        return canonicalize_url(url, drop_query=self.drop_query)
+
+    def _band_keys(self, fingerprint):
+        mask = (1 << self._band_bits) - 1
+        return [
+            fingerprint >> (band * self._band_bits) & mask
+            for band in range(len(self._bands))
+        ]
+
+    def check(self, data, filename):
+        """
+        Registers a page, or returns the output it duplicates.
+
+        Args:
+            data: Scraped data dict
+            filename: Output filename the page would be written to
+
+        Returns:
+            str: Filename of the earlier page with the same content, or
+                None if the page is new
+        """
+        texts = [h["text"] for h in data.get("headings", [])]
+        texts += data.get("paragraphs", [])
+        text = " ".join(" ".join(texts).split())
+        if not text:
+            return None
+
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        original = self._exact.get(digest)
+        if (
+            original is None
+            and self.max_distance
+            and len(text.split()) >= self.min_words
+        ):
+            fingerprint = simhash(text)
+            keys = self._band_keys(fingerprint)
+            for band, key in zip(self._bands, keys):
+                for other, other_file in band.get(key, ()):
+                    if bin(fingerprint ^ other).count("1") <= self.max_distance:
+                        original = other_file
+                        break
+                if original is not None:
+                    break
+            if original is None:
+                for band, key in zip(self._bands, keys):
+                    band.setdefault(key, []).append((fingerprint, filename))
+
+        if original is not None:
+            self.duplicates[filename] = original
+            return original
+
+        self._exact[digest] = filename
+        return None
@@ -0,0 +1,247 @@
+import html
+import json
+import re
+
+# <script> payloads cannot contain a literal "</script>", so a regex over
+# the raw bytes finds them without a second HTML parse
+_SCRIPT_RE = re.compile(rb"<script\b([^>]*)>(.*?)</script\s*>", re.I | re.S)
+_ATTR_RE = re.compile(rb"""\b(type|id)\s*=\s*["']?([^"'\s>]+)""", re.I)
+_FLIGHT_PUSH = "self.__next_f.push("
+_STATE_RE = re.compile(
+    r"window\.(__NUXT__|__INITIAL_STATE__|__PRELOADED_STATE__|__APOLLO_STATE__)"
+    r"\s*=\s*"
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Objects and lists nested deeper than this are not walked
+MAX_NESTING = 100
+
+# Keys whose string value titles the object they belong to
+TITLE_KEYS = ("headline", "title", "name", "heading")
+# Keys whose string value is body text, even when short
+TEXT_KEYS = {
+    "description",
+    "articleBody",
+    "body",
+    "content",
+    "text",
+    "summary",
+    "excerpt",
+    "abstract",
+    "answer",
+    "children",
+}
+# Keys that never hold readable content
+SKIP_KEYS = {
+    "id",
+    "key",
+    "slug",
+    "href",
+    "url",
+    "src",
+    "image",
+    "logo",
+    "icon",
+    "path",
+    "query",
+    "locale",
+    "locales",
+    "buildId",
+    "className",
+    "style",
+    "css",
+    "hash",
+    "token",
+}
+
+
+def _clean(text):
+    """Strips HTML markup and entities and collapses whitespace."""
+    if "<" in text and ">" in text:
+        text = _TAG_RE.sub(" ", text)
+    return " ".join(html.unescape(text).split())
+
+
+def _is_prose(text):
+    """Heuristic for strings worth keeping without a telling key."""
+    if len(text) < 40 or text.count(" ") < 5:
+        return False
+    if text.startswith(("http://", "https://", "/", "{", "[", "data:")):
+        return False
+    readable = sum(c.isalpha() or c.isspace() or c in ".,;:'!?-()" for c in text)
+    return readable / len(text) >= 0.85
+
+
+class EmbeddedJSONExtractor:
+    """
+    Recovers the content of pages rendered client-side from the JSON they
+    embed, without a browser.
+
+    Understands JSON-LD structured data, Next.js (__NEXT_DATA__ and the
+    app router's __next_f flight chunks), Nuxt 3 (__NUXT_DATA__),
+    window.__INITIAL_STATE__-style JSON assignments and other
+    application/json scripts. Titles become headings and body strings
+    paragraphs, nested by object depth, in payload order.
+    """
+
+    def __init__(self, min_paragraphs=3, max_blocks=2000, max_payload=10 * 1024 * 1024):
+        """
+        Args:
+            min_paragraphs: Pages with fewer <p> paragraphs than this get the
+                embedded content added
+            max_blocks: Maximum headings and paragraphs taken from one page
+            max_payload: Scripts larger than this, in bytes, are ignored
+        """
+        self.min_paragraphs = min_paragraphs
+        self.max_blocks = max_blocks
+        self.max_payload = max_payload
+
+    def needed(self, data):
+        """Whether a parsed page is thin enough to look at its scripts."""
+        return len(data["paragraphs"]) < self.min_paragraphs
+
+    def payloads(self, content):
+        """
+        Finds the JSON payloads embedded in an HTML document.
+
+        Yields:
+            tuple: (source, value) with source one of "json-ld", "next",
+                "next-flight", "nuxt", "state" or "json"
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        for attrs, body in _SCRIPT_RE.findall(content):
+            if not body.strip() or len(body) > self.max_payload:
+                continue
+            attributes = {
+                name.lower(): value.lower() for name, value in _ATTR_RE.findall(attrs)
+            }
+            script_type = attributes.get(b"type", b"")
+            script_id = attributes.get(b"id", b"")
+            text = body.decode("utf-8", errors="replace")
+
+            if script_type == b"application/ld+json":
+                source = "json-ld"
+            elif script_id == b"__next_data__":
+                source = "next"
+            elif script_id == b"__nuxt_data__":
+                source = "nuxt"
+            elif script_type == b"application/json":
+                source = "json"
+            else:
+                yield from self._script_payloads(text)
+                continue
+
+            try:
+                value = json.loads(text)
+            except (ValueError, RecursionError):
+                continue
+            if source == "next" and isinstance(value, dict):
+                value = value.get("props", {}).get("pageProps", value)
+            yield source, value
+
+    def _script_payloads(self, text):
+        """Payloads inside JavaScript: flight chunks and state assignments."""
+        for chunk in text.split(_FLIGHT_PUSH)[1:]:
+            try:
+                flight = json.loads(chunk.rsplit(")", 1)[0])
+            except (ValueError, RecursionError):
+                continue
+            if not isinstance(flight, list) or len(flight) < 2:
+                continue
+            if not isinstance(flight[1], str):
+                continue
+            # Each line is "<id>:<JSON>"; lines that are not JSON are skipped
+            for line in flight[1].splitlines():
+                _, _, row = line.partition(":")
+                try:
+                    yield "next-flight", json.loads(row)
+                except (ValueError, RecursionError):
+                    continue
+
+        match = _STATE_RE.search(text)
+        if match:
+            start = text.find("{", match.end())
+            end = text.rfind("}")
+            if start == match.end() and end > start:
+                try:
+                    yield "state", json.loads(text[start : end + 1])
+                except (ValueError, RecursionError):
+                    pass
+
+    def extract(self, content, known=()):
+        """
+        Converts the embedded JSON of a document into content blocks.
+
+        Args:
+            content: HTML document, as bytes or str
+            known: Texts already extracted from the markup, not repeated
+
+        Returns:
+            tuple: ([block, ...], [source, ...]) where blocks are heading and
+                paragraph dicts like the "blocks" of scraped data
+        """
+        blocks = []
+        sources = []
+        seen = set(known)
+        for source, value in self.payloads(content):
+            before = len(blocks)
+            self._walk(value, 0, blocks, seen)
+            if len(blocks) > before and source not in sources:
+                sources.append(source)
+            if len(blocks) >= self.max_blocks:
+                break
+        return blocks[: self.max_blocks], sources
+
+    def _add(self, blocks, seen, text, level=None):
+        text = _clean(text)
+        if not text or text in seen:
+            return False
+        seen.add(text)
+        if level is None:
+            blocks.append({"type": "paragraph", "text": text})
+        else:
+            blocks.append({"type": "heading", "level": level, "text": text})
+        return True
+
+    def _walk(self, value, depth, blocks, seen, nesting=0):
+        if len(blocks) >= self.max_blocks or nesting > MAX_NESTING:
+            return
+
+        if isinstance(value, dict):
+            title_key = None
+            for key in TITLE_KEYS:
+                title = value.get(key)
+                if isinstance(title, str) and 0 < len(title) <= 200:
+                    title_key = key
+                    break
+            # A lone name (an author, a tag...) titles nothing
+            titles_content = any(
+                key != title_key and key not in SKIP_KEYS and not key.startswith("@")
+                for key in value
+            )
+            if (
+                title_key
+                and titles_content
+                and self._add(blocks, seen, value[title_key], level=min(2 + depth, 6))
+            ):
+                depth += 1
+
+            for key, item in value.items():
+                if key == title_key or key in SKIP_KEYS:
+                    continue
+                if key.startswith(("@", "_", "$")) and key != "@graph":
+                    continue
+                if isinstance(item, str):
+                    if (key in TEXT_KEYS and " " in item.strip()) or _is_prose(item):
+                        self._add(blocks, seen, item)
+                else:
+                    self._walk(item, depth, blocks, seen, nesting + 1)
+
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, str):
+                    if _is_prose(item):
+                        self._add(blocks, seen, item)
+                else:
+                    self._walk(item, depth, blocks, seen, nesting + 1)
@@ -0,0 +1,126 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+# Timeout in seconds for callers that don't pass their own
+DEFAULT_TIMEOUT = 30
+
+_shared_session = None
+_shared_lock = threading.Lock()
+
+
+def create_session(
+    pool_connections=10,
+    pool_maxsize=32,
+    retries=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    headers=None,
+):
+    """
+    Creates a requests Session with connection pooling and retries.
+
+    Connections are kept alive and reused per host. Failed requests are
+    retried with exponential backoff (backoff_factor * 2 ** attempt),
+    honouring Retry-After on 429/503 responses.
+
+    Args:
+        pool_connections: Number of per-host connection pools to cache
+        pool_maxsize: Maximum connections kept alive per host
+        retries: Maximum number of retries per request
+        backoff_factor: Base delay in seconds for exponential backoff
+        status_forcelist: HTTP status codes that trigger a retry
+        headers: Extra default headers (merged over DEFAULT_HEADERS)
+
+    Returns:
+        requests.Session: Configured session
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=status_forcelist,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def wire_bytes(response):
+    """
+    Returns the size of a response body as received over the network.
+
+    This is the size before gzip / deflate decoding, so it is smaller than
+    len(response.content) for compressed responses. Call it once the body
+    has been read.
+
+    Args:
+        response: requests.Response
+
+    Returns:
+        int: Bytes read from the connection (Content-Length, or the decoded
+            size, when the raw stream cannot tell)
+    """
+    try:
+        return int(response.raw.tell())
+    except (AttributeError, TypeError, ValueError, OSError):
+        pass
+    length = response.headers.get("Content-Length", "")
+    if length.isdigit():
+        return int(length)
+    return len(response.content)
+
+
+def get_session():
+    """
+    Returns the process-wide shared session, creating it on first use.
+
+    Returns:
+        requests.Session: Shared session
+    """
+    global _shared_session
+    if _shared_session is None:
+        with _shared_lock:
+            if _shared_session is None:
+                _shared_session = create_session()
+    return _shared_session
+
+
+def configure(**kwargs):
+    """
+    Replaces the shared session with one built from the given options.
+
+    Accepts the same keyword arguments as create_session.
+
+    Returns:
+        requests.Session: The new shared session
+    """
+    global _shared_session
+    with _shared_lock:
+        old_session = _shared_session
+        _shared_session = create_session(**kwargs)
+    if old_session is not None:
+        old_session.close()
+    return _shared_session
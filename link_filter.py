@@ -0,0 +1,212 @@
+import hashlib
+import math
+import re
+import threading
+from urllib.parse import urlsplit
+
+
+class BloomFilter:
+    """
+    Fixed-size probabilistic set of strings.
+
+    Membership tests may return false positives at about `error_rate` once
+    `capacity` items are stored, but never false negatives. Memory is
+    about 1.2 bytes per item at a 0.1% error rate, however long the URLs.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        """
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: Target false positive rate at that capacity
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _positions(self, item):
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, item):
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item)
+        )
+
+    def add(self, item):
+        """
+        Adds an item.
+
+        Returns:
+            bool: True if the item was not (probably) present before
+        """
+        added = False
+        for pos in self._positions(item):
+            mask = 1 << (pos & 7)
+            if not self._bits[pos >> 3] & mask:
+                self._bits[pos >> 3] |= mask
+                added = True
+        if added:
+            self._count += 1
+        return added
+
+
+class SeenIndex:
+    """
+    Visited set that also remembers which URLs are already queued.
+
+    It behaves like the plain set it replaces (`in`, add, update, clear and
+    len refer to visited pages), and adds seen() / claim() for the
+    "visited or queued" check done before scheduling a link, so a page
+    linked from many others is queued once. With bloom_capacity set, both
+    sets are Bloom filters: memory stays flat on huge crawls at the cost
+    of skipping a small fraction of unseen URLs.
+    """
+
+    def __init__(self, bloom_capacity=None, error_rate=0.001):
+        """
+        Args:
+            bloom_capacity: Expected number of URLs; enables the Bloom
+                filters (None keeps exact sets)
+            error_rate: False positive rate of the Bloom filters
+        """
+        self.bloom_capacity = bloom_capacity
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self.clear()
+
+    def _new_set(self):
+        if self.bloom_capacity:
+            return BloomFilter(self.bloom_capacity, self.error_rate)
+        return set()
+
+    def __contains__(self, url):
+        return url in self._visited
+
+    def __len__(self):
+        return len(self._visited)
+
+    def add(self, url):
+        with self._lock:
+            self._visited.add(url)
+
+    def update(self, urls):
+        with self._lock:
+            for url in urls:
+                self._visited.add(url)
+
+    def clear(self):
+        with self._lock:
+            self._visited = self._new_set()
+            self._queued = self._new_set()
+
+    def seen(self, url):
+        """Whether a URL was visited or is already queued."""
+        return url in self._visited or url in self._queued
+
+    def claim(self, url):
+        """
+        Marks a URL as queued unless it was already seen.
+
+        Returns:
+            bool: True if the caller should schedule the URL
+        """
+        with self._lock:
+            if url in self._visited or url in self._queued:
+                return False
+            self._queued.add(url)
+            return True
+
+
+class LinkFilter:
+    """
+    Turns the links of a page into the child URLs worth crawling.
+
+    Each link is split once against the page's own origin (parsed once per
+    page), canonicalized, deduplicated within the page, matched against
+    the allow / deny patterns, the visited-or-queued index and, when
+    given, robots.txt, and at most max_per_page new URLs are kept. Everything pruned
+    here is a fetch that never gets queued.
+    """
+
+    def __init__(self, allow=None, deny=None, max_per_page=None, canonicalize=None):
+        """
+        Args:
+            allow: Regex patterns; when given, a URL must match one of them
+            deny: Regex patterns; a URL matching any of them is dropped
+            max_per_page: Maximum new child URLs kept per page, or None
+            canonicalize: Function normalizing a URL (by default only the
+                fragment is removed)
+        """
+        self.allow = _compile(allow)
+        self.deny = _compile(deny)
+        self.max_per_page = max_per_page
+        self.canonicalize = canonicalize
+
+    def canonical(self, url):
+        """Returns the canonical form of an absolute URL."""
+        if self.canonicalize is not None:
+            return self.canonicalize(url)
+        return url.partition("#")[0]
+
+    def allowed(self, url):
+        """Whether a URL passes the allow / deny patterns."""
+        if self.deny is not None and self.deny.search(url):
+            return False
+        return self.allow is None or bool(self.allow.search(url))
+
+    def select(self, page_url, link_urls, visited=(), can_fetch=None):
+        """
+        Picks the child URLs to crawl among a page's links.
+
+        Args:
+            page_url: URL of the page the links come from
+            link_urls: Absolute link targets, in document order
+            visited: SeenIndex (or plain set) of URLs not to return
+            can_fetch: Optional function telling whether robots.txt allows
+                a URL (e.g. RobotsCache.can_fetch)
+
+        Returns:
+            list: Canonical same-domain child URLs, in document order
+        """
+        origin = urlsplit(page_url).netloc
+        seen = getattr(visited, "seen", visited.__contains__)
+        children = []
+        page_seen = set()
+
+        for link_url in link_urls:
+            parts = urlsplit(link_url)
+            if parts.scheme not in ("http", "https") or parts.netloc != origin:
+                continue
+
+            link_url = self.canonical(link_url)
+
+            if link_url in page_seen:
+                continue
+            page_seen.add(link_url)
+
+            if not self.allowed(link_url) or seen(link_url):
+                continue
+            if can_fetch is not None and not can_fetch(link_url):
+                continue
+
+            children.append(link_url)
+            if self.max_per_page is not None and len(children) >= self.max_per_page:
+                break
+        return children
+
+
+def _compile(patterns):
+    """Combines regex patterns into one alternation (None if empty)."""
+    if not patterns:
+        return None
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
@@ -0,0 +1,266 @@
+import os
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import (
+    BaseDocTemplate,
+    Flowable,
+    Frame,
+    PageBreak,
+    PageTemplate,
+    Paragraph,
+    Spacer,
+)
+
+
+# Private BaseDocTemplate steps used to lay out chapters as they arrive;
+# without them the chapters are buffered and built in one go at close()
+_STREAMING = all(
+    callable(getattr(BaseDocTemplate, name, None))
+    for name in ("_startBuild", "clean_hanging", "handle_flowable", "_endBuild")
+)
+
+
+def _index_key(index):
+    """Sort key giving depth-first order for "1-2-10" / "1-s3" indexes."""
+    return [
+        (0, int(part), "") if part.isdigit() else (1, 0, part)
+        for part in index.split("-")
+    ]
+
+
+class _ChapterMarker(Flowable):
+    """
+    Zero-size flowable placed at the start of a chapter.
+
+    When drawn it bookmarks the page and records the page number for the
+    table of contents and the outline.
+    """
+
+    def __init__(self, key, toc_entry):
+        super().__init__()
+        self.key = key
+        self.toc_entry = toc_entry
+
+    def wrap(self, available_width, available_height):
+        return 0, 0
+
+    def draw(self):
+        self.canv.bookmarkPage(self.key)
+        self.toc_entry["page"] = self.canv.getPageNumber()
+
+
+class _TOCLine(Flowable):
+    """
+    Table of contents line, built when laid out: by then the chapters it
+    points to have been drawn and their page numbers are known.
+    """
+
+    def __init__(self, entry, style_for_level, clean_text):
+        super().__init__()
+        self.entry = entry
+        self.style_for_level = style_for_level
+        self.clean_text = clean_text
+        self._paragraph = None
+
+    def wrap(self, available_width, available_height):
+        entry = self.entry
+        self._paragraph = Paragraph(
+            f'<a href="#{entry["key"]}">{self.clean_text(entry["label"])}</a>'
+            f" — p. {entry['page']}",
+            self.style_for_level(entry["level"]),
+        )
+        return self._paragraph.wrap(available_width, available_height)
+
+    def draw(self):
+        self._paragraph.drawOn(self.canv, 0, 0)
+
+
+class _Outline(Flowable):
+    """
+    Zero-size flowable writing the document outline once every chapter is
+    placed.
+
+    Entries are added in index order, each nested under its closest
+    ancestor present in the document, whatever order the chapters were
+    crawled in (breadth-first and concurrent crawls do not arrive
+    depth-first).
+    """
+
+    def __init__(self, entries):
+        super().__init__()
+        self.entries = entries
+
+    def wrap(self, available_width, available_height):
+        return 0, 0
+
+    def draw(self):
+        levels = {}
+        for entry in sorted(self.entries, key=lambda e: _index_key(e["index"])):
+            parent = entry["index"]
+            level = 0
+            while "-" in parent:
+                parent = parent.rsplit("-", 1)[0]
+                if parent in levels:
+                    level = levels[parent] + 1
+                    break
+            levels[entry["index"]] = level
+            entry["level"] = level
+            self.canv.addOutlineEntry(entry["label"], entry["key"], level=level)
+        self.canv.showOutline()
+
+
+class MergedPDFWriter:
+    """
+    Writes many scraped pages into one PDF, one chapter per page.
+
+    Chapters are laid out as soon as they are added, so only the finished
+    pages are held (by the ReportLab canvas) rather than the whole story
+    list. This relies on private BaseDocTemplate methods; if the installed
+    ReportLab lacks them, chapters are buffered and built at close()
+    instead. Each chapter gets a bookmark and an outline entry nested by
+    its webX-Y-Z index. Page numbers are only known after layout, so the
+    table of contents is appended at the end of the document, in index
+    order like the outline.
+    """
+
+    def __init__(self, filepath, title, theme, clean_text):
+        """
+        Args:
+            filepath: Output PDF path
+            title: Document title (PDF metadata and table of contents)
+            theme: PDFTheme with the styles to use
+            clean_text: Function escaping text for Paragraph markup
+        """
+        self.filepath = filepath
+        self.title = title
+        self.theme = theme
+        self.clean_text = clean_text
+        self.toc = []
+        self._pending = []
+
+        self.doc = BaseDocTemplate(
+            filepath,
+            pagesize=letter,
+            rightMargin=50,
+            leftMargin=50,
+            topMargin=50,
+            bottomMargin=50,
+            title=title,
+        )
+        frame = Frame(
+            self.doc.leftMargin,
+            self.doc.bottomMargin,
+            self.doc.width,
+            self.doc.height,
+            id="normal",
+        )
+        self.doc.addPageTemplates([PageTemplate(id="Chapter", frames=[frame])])
+
+        if _STREAMING:
+            # Same steps as BaseDocTemplate.build, split so chapters can be
+            # fed one at a time
+            self.doc._startBuild()
+            self.doc.canv._doctemplate = self.doc
+
+    def _layout(self, flowables):
+        if not _STREAMING:
+            self._pending.extend(flowables)
+            return
+
+        flowables = list(flowables)
+        while flowables:
+            self.doc.clean_hanging()
+            self.doc.handle_flowable(flowables)
+
+    def add_chapter(self, index, title, flowables):
+        """
+        Lays out a chapter at the end of the document.
+
+        Args:
+            index: webX-Y-Z index of the page (e.g. "1-2")
+            title: Chapter title
+            flowables: Flowables of the page (see PDFWebScraper.build_story)
+        """
+        entry = {
+            "index": index,
+            "key": f"chapter{len(self.toc) + 1}",
+            "label": f"web{index} · {title or 'Sin título'}",
+            "level": 0,
+            "page": None,
+        }
+        self.toc.append(entry)
+        marker = _ChapterMarker(entry["key"], entry)
+        self._layout([marker] + list(flowables) + [PageBreak()])
+
+    def close(self):
+        """Appends the table of contents and writes the file."""
+        theme = self.theme
+        toc_entry = {"index": "toc", "key": "toc", "label": "Índice", "page": None}
+        # The outline levels are set when _Outline is drawn, before the
+        # lines below are laid out
+        story = [
+            _ChapterMarker("toc", toc_entry),
+            _Outline(self.toc + [toc_entry]),
+            Paragraph(self.clean_text(self.title), theme.title_style),
+            Paragraph("Índice", theme.section_header_style),
+            Spacer(1, 12),
+        ]
+        for entry in sorted(self.toc, key=lambda e: _index_key(e["index"])):
+            story.append(_TOCLine(entry, self._toc_style, self.clean_text))
+
+        if not _STREAMING:
+            self.doc.build(self._pending + story)
+            self._pending = []
+            return
+
+        self._layout(story)
+        del self.doc.canv._doctemplate
+        self.doc._endBuild()
+
+    def _toc_style(self, level):
+        return ParagraphStyle(
+            f"TOC{level}",
+            parent=self.theme.link_style,
+            leftIndent=20 + 15 * level,
+        )
+
+
+class MergedPDFSink:
+    """
+    Output sink rendering each urls.json configuration into a single PDF
+    (webX_completo.pdf), with pages appended as chapters in crawl order.
+
+    Pages flagged as duplicates are left out.
+    """
+
+    def __init__(self, scraper):
+        """
+        Args:
+            scraper: PDFWebScraper providing output_dir, theme and build_story
+        """
+        self.scraper = scraper
+        self.path = os.path.join(scraper.output_dir, "web*_completo.pdf")
+        self._writers = {}
+
+    def write(self, data, index, depth):
+        if data.get("duplicate_of"):
+            return
+
+        root = index.split("-")[0]
+        writer = self._writers.get(root)
+        if writer is None:
+            writer = MergedPDFWriter(
+                os.path.join(self.scraper.output_dir, f"web{root}_completo.pdf"),
+                data.get("title") or data["url"],
+                self.scraper.theme,
+                self.scraper._clean_text_for_pdf,
+            )
+            self._writers[root] = writer
+
+        writer.add_chapter(index, data.get("title"), self.scraper.build_story(data))
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
@@ -0,0 +1,267 @@
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+_default_metrics = None
+_default_lock = threading.Lock()
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (cumulative on export, like Prometheus)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q):
+        """
+        Estimates a quantile by linear interpolation inside its bucket.
+
+        Returns:
+            float: Estimated value in seconds (0.0 if empty)
+        """
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else lower
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class Metrics:
+    """
+    In-process registry of stage latencies and counters.
+
+    Recording is a perf_counter call, a bisect over the buckets and a few
+    additions under a lock, so it can stay enabled on every run. Stages
+    and counter labels are created on first use.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.started = time.time()
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        """Records one duration for a stage."""
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, stage):
+        """
+        Times the enclosed block as one observation of `stage`. Exceptions
+        are counted in errors_total by stage and type, then re-raised.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.error(stage, e)
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def inc(self, name, value=1, **labels):
+        """Adds `value` to a counter, optionally labelled."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def error(self, stage, exc):
+        """Counts an error by stage and exception type."""
+        self.inc("errors_total", stage=stage, type=type(exc).__name__)
+
+    def summary(self):
+        """
+        Returns a JSON-serializable snapshot of the metrics.
+
+        Returns:
+            dict: uptime, pages_per_second, per-stage count / total / mean /
+                p50 / p90 / p99 and all counters
+        """
+        with self._lock:
+            uptime = time.time() - self.started
+            stages = {
+                stage: {
+                    "count": h.count,
+                    "total_seconds": round(h.sum, 6),
+                    "mean_seconds": round(h.sum / h.count, 6) if h.count else 0.0,
+                    "p50_seconds": round(h.quantile(0.5), 6),
+                    "p90_seconds": round(h.quantile(0.9), 6),
+                    "p99_seconds": round(h.quantile(0.99), 6),
+                }
+                for stage, h in self._histograms.items()
+            }
+            counters = {}
+            for (name, labels), value in self._counters.items():
+                label = ",".join(f"{k}={v}" for k, v in labels)
+                counters[f"{name}{{{label}}}" if label else name] = value
+
+        pages = sum(v for k, v in counters.items() if k.startswith("pages_total"))
+        return {
+            "uptime_seconds": round(uptime, 3),
+            "pages_per_second": round(pages / uptime, 3) if uptime > 0 else 0.0,
+            "stages": stages,
+            "counters": counters,
+        }
+
+    def prometheus(self, prefix="scraper"):
+        """
+        Renders the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text
+        """
+        lines = [
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        with self._lock:
+            for stage, h in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(
+                        f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} '
+                        f"{cumulative}"
+                    )
+                lines.append(
+                    f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} '
+                    f"{h.count}"
+                )
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {h.sum}')
+                lines.append(
+                    f'{prefix}_stage_seconds_count{{stage="{stage}"}} {h.count}'
+                )
+
+            declared = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                if name not in declared:
+                    lines.append(f"# TYPE {prefix}_{name} counter")
+                    declared.add(name)
+                label = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(
+                    f"{prefix}_{name}{{{label}}} {value}"
+                    if label
+                    else f"{prefix}_{name} {value}"
+                )
+
+        lines.append(f"# TYPE {prefix}_uptime_seconds gauge")
+        lines.append(f"{prefix}_uptime_seconds {time.time() - self.started}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def get_metrics():
+    """
+    Returns the process-wide Metrics registry, creating it on first use.
+
+    Returns:
+        Metrics: Shared registry
+    """
+    global _default_metrics
+    with _default_lock:
+        if _default_metrics is None:
+            _default_metrics = Metrics()
+        return _default_metrics
+
+
+class JSONExporter:
+    """Writes Metrics.summary() to a JSON file when exported."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def export(self, metrics):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(metrics.summary(), f, indent=2)
+        print(f"📊 Metrics written: {self.path}")
+
+    def close(self):
+        pass
+
+
+class PrometheusExporter:
+    """
+    Serves the metrics at http://host:port/metrics in the Prometheus text
+    format from a background thread, for as long as the exporter is open.
+    """
+
+    def __init__(self, metrics, port=9464, host="127.0.0.1"):
+        """
+        Args:
+            metrics: Metrics registry to expose
+            port: TCP port to listen on (0 picks a free one)
+            host: Interface to bind to
+        """
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"📊 Metrics endpoint: http://{host}:{self.port}/metrics")
+
+    def export(self, metrics):
+        # Scraped live from the endpoint; nothing to write at the end
+        pass
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,177 @@
+import json
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Internal keys that are not part of the exported record
+_INTERNAL_KEYS = ("not_modified",)
+
+
+def _page_text(data):
+    """Joins the title and the page blocks into plain text."""
+    if data.get("blocks") is not None:
+        parts = [block["text"] for block in data["blocks"]]
+    else:
+        parts = [h["text"] for h in data.get("headings", [])]
+        parts += data.get("paragraphs", [])
+    return " ".join([data.get("title") or ""] + [p for p in parts if p]).strip()
+
+
+def _index_key(index):
+    return [int(part) for part in index.split("-") if part.isdigit()]
+
+
+class JSONLSink:
+    """
+    Writes one JSON line per scraped page, flushing after every record.
+
+    Nothing is kept in memory, so the file can be tailed by a downstream
+    pipeline while the crawl is running. Failed pages are written too, with
+    their "error" key.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, data, index, depth):
+        record = {k: v for k, v in data.items() if k not in _INTERNAL_KEYS}
+        record["index"] = index
+        record["depth"] = depth
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class NestedJSONSink:
+    """
+    Writes the hierarchical format of mi_scraping_personalizado.json.
+
+    Each page becomes {url, title, depth, text_preview, links_found,
+    sub_pages}, nested under its parent by the webX-Y-Z index, with depth
+    counted from 1. Only the preview fields are kept until close(), which
+    builds the tree regardless of the order pages arrived in.
+    """
+
+    def __init__(self, path, preview_chars=500):
+        self.path = path
+        self.preview_chars = preview_chars
+        self._nodes = {}
+
+    def write(self, data, index, depth):
+        if "error" in data:
+            return
+
+        text = _page_text(data)
+        if len(text) > self.preview_chars:
+            text = text[: self.preview_chars] + "..."
+
+        self._nodes[index] = {
+            "url": data["url"],
+            "title": data.get("title"),
+            "depth": depth + 1,
+            "text_preview": text,
+            "links_found": list(data.get("child_urls", [])),
+            "sub_pages": {},
+        }
+
+    def close(self):
+        tree = {}
+        for index in sorted(self._nodes, key=_index_key):
+            node = self._nodes[index]
+            parent = self._nodes.get(index.rsplit("-", 1)[0]) if "-" in index else None
+            siblings = parent["sub_pages"] if parent else tree
+            siblings[node["url"]] = node
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(tree, f, indent=2, ensure_ascii=False)
+        self._nodes = {}
+
+
+class ParquetSink:
+    """
+    Writes pages to a Parquet file in row groups of batch_size rows.
+
+    Requires pyarrow. Failed pages are skipped.
+    """
+
+    def __init__(self, path, batch_size=500):
+        if pa is None:
+            raise ImportError("pyarrow is required for Parquet output")
+
+        self.path = path
+        self.batch_size = batch_size
+        self._schema = pa.schema(
+            [
+                ("url", pa.string()),
+                ("index", pa.string()),
+                ("depth", pa.int32()),
+                ("title", pa.string()),
+                ("text", pa.string()),
+                ("headings", pa.list_(pa.string())),
+                ("paragraphs", pa.list_(pa.string())),
+                ("child_urls", pa.list_(pa.string())),
+            ]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._rows = []
+
+    def write(self, data, index, depth):
+        if "error" in data:
+            return
+
+        self._rows.append(
+            {
+                "url": data["url"],
+                "index": index,
+                "depth": depth,
+                "title": data.get("title"),
+                "text": _page_text(data),
+                "headings": [h["text"] for h in data.get("headings", [])],
+                "paragraphs": data.get("paragraphs", []),
+                "child_urls": data.get("child_urls", []),
+            }
+        )
+        if len(self._rows) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._rows:
+            table = pa.Table.from_pylist(self._rows, schema=self._schema)
+            self._writer.write_table(table)
+            self._rows = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+SINKS = {
+    "jsonl": (JSONLSink, "jsonl"),
+    "json": (NestedJSONSink, "json"),
+    "parquet": (ParquetSink, "parquet"),
+}
+
+
+def create_sink(fmt, basename):
+    """
+    Creates an output sink by format name.
+
+    Args:
+        fmt: "jsonl", "json" (nested sub_pages format) or "parquet"
+        basename: Output path without extension
+
+    Returns:
+        Sink with write(data, index, depth) and close() methods
+    """
+    if fmt not in SINKS:
+        raise ValueError(f"Unknown output format: {fmt}")
+
+    sink_class, extension = SINKS[fmt]
+    return sink_class(f"{basename}.{extension}")
@@ -0,0 +1,166 @@
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+
+
+class PDFTheme:
+    """
+    Paragraph styles used by PDFWebScraper.create_pdf.
+
+    Building the sample stylesheet and the custom ParagraphStyle objects is
+    pure overhead when repeated for every page, so a theme is built once per
+    scraper and shared by all the documents it renders. Styles are not
+    modified while rendering, so sharing them does not change the output.
+    """
+
+    def __init__(self):
+        styles = getSampleStyleSheet()
+
+        # Custom styles with better formatting
+        self.url_style = ParagraphStyle(
+            "URLStyle",
+            parent=styles["Normal"],
+            fontSize=10,
+            textColor=colors.HexColor("#666666"),
+            spaceAfter=6,
+            alignment=TA_LEFT,
+        )
+
+        self.title_style = ParagraphStyle(
+            "CustomTitle",
+            parent=styles["Title"],
+            fontSize=28,
+            textColor=colors.HexColor("#2C3E50"),
+            spaceAfter=20,
+            spaceBefore=10,
+            alignment=TA_LEFT,
+            leading=32,
+        )
+
+        # Heading styles with better hierarchy
+        self.heading_styles = {
+            1: ParagraphStyle(
+                "Heading1",
+                parent=styles["Heading1"],
+                fontSize=20,
+                textColor=colors.HexColor("#34495E"),
+                spaceAfter=12,
+                spaceBefore=20,
+                borderWidth=0,
+                borderPadding=0,
+                borderColor=colors.HexColor("#3498DB"),
+                borderRadius=0,
+                leading=24,
+            ),
+            2: ParagraphStyle(
+                "Heading2",
+                parent=styles["Heading2"],
+                fontSize=18,
+                textColor=colors.HexColor("#34495E"),
+                spaceAfter=10,
+                spaceBefore=16,
+                leading=22,
+            ),
+            3: ParagraphStyle(
+                "Heading3",
+                parent=styles["Heading3"],
+                fontSize=16,
+                textColor=colors.HexColor("#34495E"),
+                spaceAfter=8,
+                spaceBefore=12,
+                leading=20,
+            ),
+            4: ParagraphStyle(
+                "Heading4",
+                parent=styles["Heading4"],
+                fontSize=14,
+                textColor=colors.HexColor("#34495E"),
+                spaceAfter=6,
+                spaceBefore=10,
+                leading=18,
+            ),
+            5: ParagraphStyle(
+                "Heading5",
+                parent=styles["Heading5"],
+                fontSize=12,
+                textColor=colors.HexColor("#34495E"),
+                spaceAfter=4,
+                spaceBefore=8,
+                leading=16,
+            ),
+            6: ParagraphStyle(
+                "Heading6",
+                parent=styles["Heading6"],
+                fontSize=11,
+                textColor=colors.HexColor("#34495E"),
+                spaceAfter=4,
+                spaceBefore=6,
+                leading=14,
+            ),
+        }
+
+        self.paragraph_style = ParagraphStyle(
+            "CustomParagraph",
+            parent=styles["Normal"],
+            fontSize=11,
+            textColor=colors.HexColor("#2C3E50"),
+            alignment=TA_JUSTIFY,
+            spaceAfter=12,
+            leading=16,
+            firstLineIndent=0,
+        )
+
+        self.link_style = ParagraphStyle(
+            "LinkStyle",
+            parent=styles["Normal"],
+            textColor=colors.HexColor("#3498DB"),
+            fontSize=10,
+            leftIndent=20,
+            spaceAfter=4,
+        )
+
+        self.section_header_style = ParagraphStyle(
+            "SectionHeader",
+            parent=styles["Heading2"],
+            fontSize=16,
+            textColor=colors.HexColor("#2C3E50"),
+            spaceAfter=12,
+            spaceBefore=24,
+            alignment=TA_LEFT,
+            borderWidth=1,
+            borderColor=colors.HexColor("#BDC3C7"),
+            borderPadding=10,
+            backColor=colors.HexColor("#ECF0F1"),
+        )
+
+        self.error_style = ParagraphStyle(
+            "ErrorStyle",
+            parent=styles["Normal"],
+            textColor=colors.red,
+            fontSize=12,
+            borderWidth=1,
+            borderColor=colors.red,
+            borderPadding=10,
+            backColor=colors.HexColor("#FFEBEE"),
+        )
+
+        self.no_content_style = ParagraphStyle(
+            "NoContent",
+            parent=styles["Normal"],
+            fontSize=12,
+            textColor=colors.HexColor("#7F8C8D"),
+            alignment=TA_CENTER,
+            spaceAfter=12,
+            spaceBefore=12,
+        )
+
+        self.footer_style = ParagraphStyle(
+            "Footer",
+            parent=styles["Normal"],
+            fontSize=8,
+            textColor=colors.HexColor("#7F8C8D"),
+            alignment=TA_CENTER,
+        )
+
+        # Color of the horizontal rules around the content
+        self.rule_color = colors.HexColor("#BDC3C7")
@@ -1,82 +1,584 @@
-from pptx import Presentation
+import io
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from urllib.parse import unquote, urlparse
+
 from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.lib.utils import simpleSplit
 from reportlab.pdfgen import canvas
-import requests
-import io
 
+import http_client
+from metrics import get_metrics
+
+# Espacios de nombres de PresentationML / DrawingML
+NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
 
-def pptx_url_to_pdf_bytes(pptx_url):
+# Versión del conversor: cambiarla invalida los PDF guardados en caché
+CONVERTER_VERSION = "2"
+
+# Tamaño a partir del cual la descarga se vuelca de memoria a disco
+SPOOL_MAX_SIZE = 16 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+
+def download_to_spool(url, session=None, spool_max_size=SPOOL_MAX_SIZE):
     """
-    Descarga un PPTX desde una URL y lo convierte a PDF en memoria.
+    Descarga una URL por bloques a un SpooledTemporaryFile.
+
+    Los ficheros pequeños se quedan en memoria; los grandes pasan a disco
+    al superar spool_max_size, así que la descarga nunca se carga entera.
 
     Args:
-        pptx_url (str): URL del archivo PPTX
+        url (str): URL a descargar
+        session (requests.Session, opcional): Sesión HTTP a usar
+        spool_max_size (int): Bytes máximos en memoria antes de ir a disco
 
     Returns:
-        bytes: El PDF generado como bytes
+        SpooledTemporaryFile: Fichero posicionado al inicio (el llamador
+            debe cerrarlo)
     """
+    session = session or http_client.get_session()
+    spool = tempfile.SpooledTemporaryFile(max_size=spool_max_size)
+    try:
+        with get_metrics().time("pptx_download"), session.get(
+            url, stream=True, timeout=http_client.DEFAULT_TIMEOUT
+        ) as response:
+            response.raise_for_status()  # Lanza excepción si hay error HTTP
+            for chunk in response.iter_content(CHUNK_SIZE):
+                spool.write(chunk)
+            get_metrics().inc("bytes_fetched_total", http_client.wire_bytes(response))
+    except Exception:
+        spool.close()
+        raise
 
-    # Descargar el PPTX desde la URL
-    response = requests.get(pptx_url)
-    response.raise_for_status()  # Lanza excepción si hay error HTTP
+    spool.seek(0)
+    return spool
 
-    # Cargar el PPTX desde los bytes descargados
-    pptx_bytes = io.BytesIO(response.content)
-    presentation = Presentation(pptx_bytes)
 
-    # Crear buffer en memoria para el PDF
-    pdf_buffer = io.BytesIO()
+def _resolve_target(base_dir, target):
+    """Resuelve el destino de una relación del paquete a una ruta del ZIP."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(base_dir, target))
+
+
+def _slide_paths(package):
+    """Devuelve las rutas de las diapositivas dentro del ZIP, en orden."""
+    presentation = ET.fromstring(package.read("ppt/presentation.xml"))
+    rels = ET.fromstring(package.read("ppt/_rels/presentation.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels}
+
+    return [
+        _resolve_target("ppt", targets[slide_id.get(f"{{{NS['r']}}}id")])
+        for slide_id in presentation.iterfind("p:sldIdLst/p:sldId", NS)
+    ]
+
+
+def _notes_path(package, slide_path):
+    """Ruta de la diapositiva de notas asociada, o None si no tiene."""
+    directory, name = posixpath.split(slide_path)
+    rels_path = f"{directory}/_rels/{name}.rels"
+    if rels_path not in package.NameToInfo:
+        return None
+
+    for rel in ET.fromstring(package.read(rels_path)):
+        if rel.get("Type", "").endswith("/notesSlide"):
+            return _resolve_target(directory, rel.get("Target"))
+    return None
+
+
+def _paragraph_text(paragraph):
+    """Texto de un párrafo a:p (los saltos de línea a:br se leen como \\v)."""
+    parts = []
+    for element in paragraph:
+        if element.tag == f"{{{NS['a']}}}br":
+            parts.append("\v")
+        elif element.tag in (f"{{{NS['a']}}}r", f"{{{NS['a']}}}fld"):
+            parts.append(element.findtext("a:t", default="", namespaces=NS))
+    return "".join(parts)
+
+
+def _text_body(element):
+    """Texto de un p:txBody o a:txBody, un párrafo por línea."""
+    if element is None:
+        return ""
+    return "\n".join(_paragraph_text(p) for p in element.iterfind("a:p", NS))
+
+
+def _table_text(table):
+    """Texto de una tabla a:tbl: una fila por línea y celdas separadas por |."""
+    rows = []
+    for row in table.iterfind("a:tr", NS):
+        cells = [
+            " ".join(_text_body(cell.find("a:txBody", NS)).split())
+            for cell in row.iterfind("a:tc", NS)
+        ]
+        rows.append(" | ".join(cells))
+    return "\n".join(rows)
+
+
+def _shape_texts(tree):
+    """
+    Recorre las formas de un p:spTree (o p:grpSp) en orden de documento.
+
+    Entra recursivamente en los grupos y lee las tablas de los marcos
+    gráficos; imágenes y conectores no tienen texto y se ignoran.
+    """
+    for shape in tree:
+        tag = shape.tag
+        if tag == f"{{{NS['p']}}}sp":
+            yield _text_body(shape.find("p:txBody", NS))
+        elif tag == f"{{{NS['p']}}}grpSp":
+            yield from _shape_texts(shape)
+        elif tag == f"{{{NS['p']}}}graphicFrame":
+            table = shape.find("a:graphic/a:graphicData/a:tbl", NS)
+            if table is not None:
+                yield _table_text(table)
+
 
-    # Crear el PDF en memoria
-    c = canvas.Canvas(pdf_buffer, pagesize=letter)
-    width, height = letter
+def _notes_text(package, notes_path):
+    """Texto del marcador de cuerpo de una diapositiva de notas."""
+    with package.open(notes_path) as notes_xml:
+        notes = ET.parse(notes_xml).getroot()
+
+    for shape in notes.iterfind("p:cSld/p:spTree/p:sp", NS):
+        placeholder = shape.find("p:nvSpPr/p:nvPr/p:ph", NS)
+        if placeholder is not None and placeholder.get("type") == "body":
+            return _text_body(shape.find("p:txBody", NS))
+    return ""
+
+
+def iter_slide_texts(pptx_file):
+    """
+    Extrae el texto de las diapositivas de un PPTX de forma perezosa.
+
+    Lee el XML de cada diapositiva directamente del ZIP cuando se pide, sin
+    cargar imágenes ni otros medios embebidos en memoria. Incluye el texto
+    de formas agrupadas, tablas y notas del orador en una sola pasada por
+    diapositiva.
+
+    Args:
+        pptx_file: Ruta o fichero binario (seekable) del PPTX
+
+    Yields:
+        dict: Por diapositiva, "shapes" (textos de las formas en orden) y
+            "notes" (notas del orador, vacío si no hay)
+    """
+    with zipfile.ZipFile(pptx_file) as package:
+        for path in _slide_paths(package):
+            with package.open(path) as slide_xml:
+                slide = ET.parse(slide_xml).getroot()
+
+            notes_path = _notes_path(package, path)
+            yield {
+                "shapes": list(_shape_texts(slide.find("p:cSld/p:spTree", NS))),
+                "notes": _notes_text(package, notes_path) if notes_path else "",
+            }
+
+
+def _wrap_line(text, font, size, max_width):
+    """
+    Parte una línea en trozos que caben en max_width.
+
+    simpleSplit solo corta en los espacios: las palabras más anchas que la
+    página (URLs, identificadores largos, texto CJK sin espacios) se
+    cortan además carácter a carácter para que no se salgan del margen.
+    """
+    lines = []
+    for line in simpleSplit(text, font, size, max_width) or [""]:
+        if stringWidth(line, font, size) <= max_width:
+            lines.append(line)
+            continue
+        start = 0
+        width = 0
+        for i, char in enumerate(line):
+            char_width = stringWidth(char, font, size)
+            if width + char_width > max_width and i > start:
+                lines.append(line[start:i])
+                start = i
+                width = 0
+            width += char_width
+        lines.append(line[start:])
+    return lines
+
+
+class _TextFlow:
+    """
+    Escribe líneas en el canvas ajustándolas al ancho de página.
+
+    Las líneas se acumulan en un único objeto de texto por página, en lugar
+    de una llamada a drawString por línea, y se pasa de página al llegar
+    al margen inferior.
+    """
+
+    def __init__(self, c, margin=50):
+        self.c = c
+        self.margin = margin
+        self.width, self.height = c._pagesize
+        self.max_width = self.width - 2 * margin
+        self.text = None
+
+    def new_page(self):
+        if self.text is not None:
+            self.c.drawText(self.text)
+            self.c.showPage()
+        self.text = self.c.beginText(self.margin, self.height - self.margin)
+
+    def write(self, text, font="Helvetica", size=12, leading=20, indent=0):
+        """Escribe un texto (puede tener \\n o \\v) ajustado al ancho."""
+        self.text.setFont(font, size, leading)
+        for raw_line in re.split("[\n\v]", text):
+            for line in _wrap_line(raw_line, font, size, self.max_width - indent):
+                if self.text.getY() < self.margin:
+                    self.new_page()
+                    self.text.setFont(font, size, leading)
+                self.text.setXPos(indent)
+                self.text.textLine(line)
+                self.text.setXPos(-indent)
+
+    def skip(self, points):
+        self.text.moveCursor(0, points)
+
+    def close(self):
+        if self.text is not None:
+            self.c.drawText(self.text)
+
+
+def render_slides_to_pdf(slides, output):
+    """
+    Dibuja las diapositivas en un PDF.
+
+    Args:
+        slides: Iterable de diapositivas como las devuelve iter_slide_texts
+        output: Ruta o fichero binario donde escribir el PDF
+    """
+    c = canvas.Canvas(output, pagesize=letter)
+    flow = _TextFlow(c)
 
     # Procesar cada diapositiva
-    for slide_num, slide in enumerate(presentation.slides):
-        if slide_num > 0:
-            c.showPage()
+    for slide_num, slide in enumerate(slides):
+        flow.new_page()
 
         # Título de la diapositiva
-        y_position = height - 50
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(50, y_position, f"Diapositiva {slide_num + 1}")
-
-        # Extraer texto
-        y_position -= 40
-        c.setFont("Helvetica", 12)
-
-        for shape in slide.shapes:
-            if hasattr(shape, "text"):
-                text = shape.text.strip()
-                if text:
-                    lines = text.split("\n")
-                    for line in lines:
-                        if y_position < 50:
-                            c.showPage()
-                            y_position = height - 50
-
-                        c.drawString(50, y_position, line[:80])
-                        y_position -= 20
-
-    # Guardar el PDF en el buffer
+        flow.write(f"Diapositiva {slide_num + 1}", "Helvetica-Bold", 16, leading=40)
+
+        # Texto de las formas, ajustado al ancho de la página
+        for text in slide["shapes"]:
+            text = text.strip()
+            if text:
+                flow.write(text)
+
+        # Notas del orador
+        notes = slide["notes"].strip()
+        if notes:
+            flow.skip(10)
+            flow.write("Notas:", "Helvetica-BoldOblique", 10, leading=16)
+            flow.write(notes, "Helvetica-Oblique", 10, leading=14, indent=10)
+
+    # Guardar el PDF en el destino
+    flow.close()
     c.save()
 
-    # Obtener los bytes del PDF
-    pdf_bytes = pdf_buffer.getvalue()
-    pdf_buffer.close()
 
-    return pdf_bytes
+def pptx_to_pdf(pptx_file, output):
+    """
+    Convierte un PPTX local a PDF.
 
+    Args:
+        pptx_file: Ruta o fichero binario (seekable) del PPTX
+        output: Ruta o fichero binario donde escribir el PDF
+    """
+    with get_metrics().time("pptx_convert"):
+        render_slides_to_pdf(iter_slide_texts(pptx_file), output)
 
-# Ejemplo de uso (descomenta para probar)
-if __name__ == "__main__":
-    url_pptx = "https://scholar.harvard.edu/files/torman_personal/files/samplepptx.pptx"
+
+def pptx_url_to_pdf_file(
+    pptx_url, output, session=None, spool_max_size=SPOOL_MAX_SIZE, cache=None
+):
+    """
+    Descarga un PPTX desde una URL y escribe el PDF directamente en `output`.
+
+    La descarga va a un SpooledTemporaryFile y el texto se extrae
+    diapositiva a diapositiva, así que la memoria no crece con el tamaño del
+    PPTX (por ejemplo, con vídeos o imágenes embebidas).
+
+    Args:
+        pptx_url (str): URL del archivo PPTX
+        output: Ruta o fichero binario donde escribir el PDF
+        session (requests.Session, opcional): Sesión HTTP a usar. Por defecto
+            la sesión compartida con pool de conexiones de http_client
+        spool_max_size (int): Bytes de la descarga que se mantienen en
+            memoria antes de volcarla a disco
+        cache (ConversionCache, opcional): Caché de conversiones. Si el PPTX
+            no ha cambiado se copia el PDF guardado sin convertir nada
+    """
+    if cache is not None:
+        with cache.open(
+            pptx_url,
+            "pptx_to_pdf",
+            CONVERTER_VERSION,
+            lambda source, pdf_path, response: pptx_to_pdf(source, pdf_path),
+            session=session,
+        ) as pdf:
+            if isinstance(output, str):
+                with open(output, "wb") as f:
+                    shutil.copyfileobj(pdf, f)
+            else:
+                shutil.copyfileobj(pdf, output)
+        return
+
+    with download_to_spool(pptx_url, session, spool_max_size) as spool:
+        pptx_to_pdf(spool, output)
+
+
+def pptx_url_to_pdf_bytes(pptx_url, session=None, cache=None):
+    """
+    Descarga un PPTX desde una URL y lo convierte a PDF en memoria.
+
+    Args:
+        pptx_url (str): URL del archivo PPTX
+        session (requests.Session, opcional): Sesión HTTP a usar. Por defecto
+            la sesión compartida con pool de conexiones de http_client
+        cache (ConversionCache, opcional): Caché de conversiones compartida
+
+    Returns:
+        bytes: El PDF generado como bytes
+    """
+    pdf_buffer = io.BytesIO()
+    pptx_url_to_pdf_file(pptx_url, pdf_buffer, session=session, cache=cache)
+    return pdf_buffer.getvalue()
+
+
+class BatchStats:
+    """Acumula resultados de una conversión por lotes y resume el rendimiento."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.converted = 0
+        self.failed = 0
+        self.input_bytes = 0
+        self.output_bytes = 0
+
+    def record(self, result):
+        if result["error"]:
+            self.failed += 1
+        else:
+            self.converted += 1
+            self.input_bytes += result["input_bytes"]
+            self.output_bytes += result["output_bytes"]
+
+    def summary(self):
+        """
+        Returns:
+            dict: Presentaciones convertidas y fallidas, tiempo total,
+                presentaciones por segundo y MB/s de PPTX procesados
+        """
+        elapsed = time.perf_counter() - self.started
+        return {
+            "converted": self.converted,
+            "failed": self.failed,
+            "seconds": elapsed,
+            "decks_per_second": self.converted / elapsed if elapsed > 0 else 0.0,
+            "mb_per_second": (
+                self.input_bytes / 1024 / 1024 / elapsed if elapsed > 0 else 0.0
+            ),
+        }
+
+    def report(self):
+        summary = self.summary()
+        print(
+            f"\n📊 {summary['converted']} convertidas, {summary['failed']} con error "
+            f"en {summary['seconds']:.1f}s"
+        )
+        print(
+            f"   {summary['decks_per_second']:.2f} presentaciones/s  "
+            f"{summary['mb_per_second']:.2f} MB/s"
+        )
+
+
+def _is_url(source):
+    return urlparse(source).scheme in ("http", "https")
+
+
+def _output_paths(sources, output_dir):
+    """Asigna un PDF de salida a cada origen, sin repetir nombres."""
+    used = set()
+    paths = []
+    for source in sources:
+        name = (
+            os.path.basename(unquote(urlparse(source).path))
+            if _is_url(source)
+            else os.path.basename(source)
+        )
+        stem = os.path.splitext(name)[0] or "presentacion"
+
+        candidate, n = stem, 1
+        while candidate in used:
+            n += 1
+            candidate = f"{stem}_{n}"
+        used.add(candidate)
+        paths.append(os.path.join(output_dir, f"{candidate}.pdf"))
+    return paths
+
+
+def _download_to_file(url, session, directory):
+    """Descarga por bloques a un fichero temporal en `directory`."""
+    session = session or http_client.get_session()
+    fd, path = tempfile.mkstemp(suffix=".pptx", dir=directory)
+    with os.fdopen(fd, "wb") as f:
+        with session.get(
+            url, stream=True, timeout=http_client.DEFAULT_TIMEOUT
+        ) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+    return path
+
+
+def _convert_worker(pptx_path, output_path):
+    """Conversión dentro del pool de procesos; devuelve los tamaños en bytes."""
+    pptx_to_pdf(pptx_path, output_path)
+    return os.path.getsize(pptx_path), os.path.getsize(output_path)
+
+
+def convert_batch(
+    sources, output_dir, processes=None, download_workers=8, session=None
+):
+    """
+    Convierte muchas presentaciones (URLs o rutas locales) a PDF.
+
+    Las URLs se descargan en paralelo con hilos y la conversión se hace en
+    un pool de procesos, así que descarga y conversión se solapan. Los
+    resultados se devuelven según terminan, no en el orden de entrada, y un
+    error en una presentación no detiene el resto.
+
+    Args:
+        sources (list): URLs http(s) o rutas locales de archivos PPTX
+        output_dir (str): Directorio donde escribir los PDF
+        processes (int, opcional): Procesos de conversión (por defecto, uno
+            por CPU)
+        download_workers (int): Descargas simultáneas
+        session (requests.Session, opcional): Sesión HTTP a usar. Por defecto
+            la sesión compartida con pool de conexiones de http_client
+
+    Yields:
+        dict: Resultado de cada presentación con source, output,
+            input_bytes, output_bytes, seconds y error (None si fue bien)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    sources = list(sources)
+
+    temp_dir = tempfile.mkdtemp(prefix="pptx_batch_")
+    downloads = ThreadPoolExecutor(download_workers)
+    converter = ProcessPoolExecutor(processes)
     try:
-        pdf_bytes = pptx_url_to_pdf_bytes(url_pptx)
-        print(f"✅ PDF generado: {len(pdf_bytes)} bytes")
-
-        # Opcional: guardar los bytes en un archivo
-        with open("outputs/pdf/desde_url.pdf", "wb") as f:
-            f.write(pdf_bytes)
-    except Exception as e:
-        print(f"❌ Error al convertir desde URL: {e}")
+        pending = {}
+        for source, output in zip(sources, _output_paths(sources, output_dir)):
+            started = time.perf_counter()
+            if _is_url(source):
+                future = downloads.submit(_download_to_file, source, session, temp_dir)
+                pending[future] = ("download", source, output, started, None)
+            else:
+                future = converter.submit(_convert_worker, source, output)
+                pending[future] = ("convert", source, output, started, None)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, source, output, started, download = pending.pop(future)
+                if download:
+                    os.remove(download)
+                try:
+                    value = future.result()
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                else:
+                    if stage == "download":
+                        # Encadenar la conversión del fichero descargado
+                        future = converter.submit(_convert_worker, value, output)
+                        pending[future] = ("convert", source, output, started, value)
+                        continue
+                    error = None
+
+                input_bytes, output_bytes = value if error is None else (0, 0)
+                yield {
+                    "source": source,
+                    "output": output if error is None else None,
+                    "input_bytes": input_bytes,
+                    "output_bytes": output_bytes,
+                    "seconds": time.perf_counter() - started,
+                    "error": error,
+                }
+    finally:
+        downloads.shutdown(cancel_futures=True)
+        converter.shutdown(cancel_futures=True)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Convierte presentaciones PPTX (URLs o rutas locales) a PDF"
+    )
+    parser.add_argument("sources", nargs="*", help="URLs o rutas de archivos PPTX")
+    parser.add_argument(
+        "-i",
+        "--input",
+        help="Archivo de texto con una URL o ruta por línea",
+    )
+    parser.add_argument(
+        "-o", "--output-dir", default="outputs/pdf", help="Directorio de salida"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Procesos de conversión (por defecto, uno por CPU)",
+    )
+    parser.add_argument(
+        "--download-workers", type=int, default=8, help="Descargas simultáneas"
+    )
+    args = parser.parse_args()
+
+    sources = list(args.sources)
+    if args.input:
+        with open(args.input, encoding="utf-8") as f:
+            sources += [line.strip() for line in f if line.strip()]
+    if not sources:
+        parser.error("indica al menos una URL o ruta, o un archivo con --input")
+
+    stats = BatchStats()
+    for result in convert_batch(
+        sources,
+        args.output_dir,
+        processes=args.processes,
+        download_workers=args.download_workers,
+    ):
+        stats.record(result)
+        if result["error"]:
+            print(f"❌ {result['source']}: {result['error']}")
+        else:
+            print(
+                f"✅ {result['source']} → {result['output']} "
+                f"({result['output_bytes'] / 1024:.0f} KB, {result['seconds']:.2f}s)"
+            )
+    stats.report()
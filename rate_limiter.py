@@ -0,0 +1,167 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Status codes that mean the server wants us to slow down
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value):
+    """
+    Parses a Retry-After header (seconds or HTTP date).
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class _HostState:
+    def __init__(self, delay, floor):
+        self.delay = delay
+        self.floor = floor
+        self.next_time = 0.0
+        self.blocked_until = 0.0
+
+
+class HostRateLimiter:
+    """
+    Per-host token-bucket scheduler with an adaptive rate.
+
+    Each host starts at one request every base_delay seconds, with bursts of
+    up to `burst` requests. The delay shrinks while responses are fast and
+    grows when latency rises or requests fail. A 429/503 doubles it and
+    blocks the host for the Retry-After period. The delay never drops below
+    min_delay or the host's robots.txt Crawl-delay.
+    """
+
+    def __init__(
+        self,
+        base_delay=0.5,
+        min_delay=None,
+        max_delay=30.0,
+        burst=1,
+        latency_target=1.0,
+        robots=None,
+    ):
+        """
+        Args:
+            base_delay: Initial delay between requests to a host, in seconds
+            min_delay: Lowest delay the limiter may adapt down to
+                (defaults to a quarter of base_delay)
+            max_delay: Highest delay the limiter may back off to
+            burst: Requests a host may receive back to back
+            latency_target: Response time (seconds) below which the rate is
+                increased
+            robots: Optional RobotsCache providing Crawl-delay per host
+        """
+        self.base_delay = base_delay
+        self.min_delay = base_delay / 4 if min_delay is None else min_delay
+        self.max_delay = max_delay
+        self.burst = burst
+        self.latency_target = latency_target
+        self.robots = robots
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            state = self._hosts.get(host)
+        if state is not None:
+            return state
+
+        # Fetched outside the lock: robots.txt may take a while
+        floor = self.min_delay
+        if self.robots is not None:
+            crawl_delay = self.robots.crawl_delay(url)
+            if crawl_delay is not None:
+                floor = max(floor, crawl_delay)
+
+        with self._lock:
+            return self._hosts.setdefault(
+                host, _HostState(max(self.base_delay, floor), floor)
+            )
+
+    def _reserve(self, state):
+        """Reserves the next request slot and returns the seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            earliest = max(state.next_time - (self.burst - 1) * state.delay, now)
+            start = max(earliest, state.blocked_until)
+            state.next_time = max(state.next_time, start) + state.delay
+            return start - now
+
+    def acquire(self, url):
+        """Blocks until a request to the URL's host is allowed."""
+        wait = self._reserve(self._host_state(url))
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, url):
+        """Async variant of acquire."""
+        host = urlparse(url).netloc
+        state = self._hosts.get(host)
+        if state is None:
+            state = await asyncio.to_thread(self._host_state, url)
+        wait = self._reserve(state)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def feedback(self, url, response=None, latency=None, error=None):
+        """
+        Adapts the host's rate to the outcome of a request.
+
+        Args:
+            url: Requested URL
+            response: requests.Response, if one was received
+            latency: Request duration in seconds
+            error: Exception raised by the request, if any
+        """
+        state = self._host_state(url)
+        throttled = False
+        retry_after = None
+
+        if response is not None:
+            throttled = response.status_code in THROTTLE_STATUSES
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            # Throttling absorbed by the session's own retries still counts
+            retries = getattr(getattr(response, "raw", None), "retries", None)
+            for attempt in getattr(retries, "history", None) or ():
+                if attempt.status in THROTTLE_STATUSES:
+                    throttled = True
+
+        with self._lock:
+            if throttled:
+                state.delay = min(self.max_delay, max(state.delay * 2, 1.0))
+                if retry_after is not None:
+                    state.blocked_until = max(
+                        state.blocked_until, time.monotonic() + retry_after
+                    )
+            elif error is not None or (
+                response is not None and response.status_code >= 500
+            ):
+                state.delay = min(self.max_delay, max(state.delay * 1.5, 0.1))
+            elif latency is not None and latency > 2 * self.latency_target:
+                state.delay = min(self.max_delay, state.delay * 1.25)
+            elif latency is not None and latency < self.latency_target:
+                state.delay = max(state.floor, state.delay * 0.9)
+
+    def delay_for(self, url):
+        """Returns the current delay for the URL's host, in seconds."""
+        return self._host_state(url).delay
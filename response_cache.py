@@ -0,0 +1,189 @@
+import json
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    """
+    On-disk HTTP response cache for re-crawls, keyed by URL.
+
+    Stores the ETag / Last-Modified validators of each page together with the
+    extracted data dict, so an unchanged page (304) can skip both parsing and
+    PDF rendering. The PDF a page was last rendered to is remembered too,
+    since the same filename may belong to another URL in a later crawl.
+    Entries are evicted least-recently-used first once the total stored
+    size exceeds max_bytes.
+    """
+
+    def __init__(self, path="webs/.http_cache.sqlite", max_bytes=256 * 1024 * 1024):
+        """
+        Opens (or creates) the cache database.
+
+        Args:
+            path: SQLite file holding the cache
+            max_bytes: Size cap for the stored data, in bytes
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                data TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                rendered TEXT
+            )
+            """
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(responses)")]
+        if "rendered" not in columns:
+            # Caches written before rendered files were tracked
+            self._conn.execute("ALTER TABLE responses ADD COLUMN rendered TEXT")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_used)"
+        )
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def conditional_headers(self, url):
+        """
+        Returns the If-None-Match / If-Modified-Since headers for a URL.
+
+        Returns:
+            dict: Request headers (empty if the URL is not cached)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return {}
+
+        headers = {}
+        etag, last_modified = row
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def get(self, url):
+        """
+        Returns the cached data for a URL after a 304, marking it as used.
+
+        Returns:
+            dict: Cached data, or None if the URL is not cached
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if not row:
+                # Counted as a miss by put() once the page is refetched
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET last_used = ? WHERE url = ?", (time.time(), url)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, url, response, data):
+        """
+        Stores the data extracted from a 200 response, counting a miss.
+
+        Responses without ETag or Last-Modified are not cached, since they
+        cannot be revalidated.
+
+        Args:
+            url: Requested URL
+            response: requests.Response the data was extracted from
+            data: Extracted data dict
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+        with self._lock:
+            self.misses += 1
+            if not etag and not last_modified:
+                return
+
+            payload = json.dumps(data, ensure_ascii=False)
+            size = len(payload.encode("utf-8"))
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if old:
+                self._total_bytes -= old[0]
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, NULL)",
+                (url, etag, last_modified, payload, size, time.time()),
+            )
+            self._total_bytes += size
+            self._evict()
+            self._conn.commit()
+
+    def rendered_file(self, url):
+        """
+        Returns the PDF filename a URL was last rendered to.
+
+        Returns:
+            str: Filename, or None if the URL was never rendered
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rendered FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def mark_rendered(self, url, filename):
+        """Records the PDF filename a cached URL was rendered to."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET rendered = ? WHERE url = ?", (filename, url)
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """Drops least-recently-used entries until under max_bytes."""
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT url, size FROM responses ORDER BY last_used LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+
+            for url, size in rows:
+                self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                self._total_bytes -= size
+                self.evictions += 1
+                if self._total_bytes <= self.max_bytes:
+                    return
+
+    def report(self):
+        """Prints hit/miss counts for the run."""
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        print(
+            f"🗄️  HTTP cache: {self.hits} hits, {self.misses} misses "
+            f"({rate:.0f}% hit rate), {self.evictions} evictions, "
+            f"{self._total_bytes / 1024:.0f} KB stored"
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
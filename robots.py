@@ -0,0 +1,137 @@
+import threading
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import http_client
+
+
+def parse_crawl_delays(lines):
+    """
+    Extracts Crawl-delay values per user agent from robots.txt lines.
+
+    RobotFileParser only keeps integer delays of groups that also have
+    Allow/Disallow rules; this accepts fractional values and rule-less
+    groups.
+
+    Returns:
+        dict: Lowercased user agent -> delay in seconds
+    """
+    delays = {}
+    agents = []
+    in_rules = False
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if ":" not in line:
+            continue
+
+        key, value = (part.strip() for part in line.split(":", 1))
+        key = key.lower()
+        if key == "user-agent":
+            if in_rules:
+                agents = []
+                in_rules = False
+            agents.append(value.lower())
+        elif key == "crawl-delay":
+            in_rules = True
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for agent in agents:
+                delays.setdefault(agent, delay)
+        else:
+            in_rules = True
+    return delays
+
+
+class RobotsCache:
+    """
+    Fetches and parses robots.txt once per host, including its Sitemap:
+    lines.
+
+    A missing or unreachable robots.txt allows everything, like
+    RobotFileParser does for 4xx responses.
+    """
+
+    def __init__(self, session=None, user_agent="*", timeout=10):
+        """
+        Args:
+            session: requests.Session used to fetch robots.txt (defaults to
+                the shared session from http_client)
+            user_agent: User agent matched against robots.txt groups
+            timeout: Timeout for the robots.txt request, in seconds
+        """
+        self.session = session or http_client.get_session()
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self._parsers = {}
+        self._delays = {}
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        """
+        Returns the parsed robots.txt for the host of a URL.
+
+        Returns:
+            RobotFileParser: Parser for the host
+        """
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+
+        with self._lock:
+            parser = self._parsers.get(origin)
+        if parser is not None:
+            return parser
+
+        parser, delays = self._fetch(origin)
+        with self._lock:
+            self._delays.setdefault(origin, delays)
+            return self._parsers.setdefault(origin, parser)
+
+    def _fetch(self, origin):
+        parser = RobotFileParser(f"{origin}/robots.txt")
+        try:
+            response = self.session.get(parser.url, timeout=self.timeout)
+        except Exception:
+            parser.allow_all = True
+            return parser, {}
+
+        if response.status_code in (401, 403):
+            parser.disallow_all = True
+        elif response.status_code >= 400:
+            parser.allow_all = True
+        else:
+            lines = response.text.splitlines()
+            parser.parse(lines)
+            return parser, parse_crawl_delays(lines)
+        return parser, {}
+
+    def can_fetch(self, url):
+        """Returns True if robots.txt allows fetching the URL."""
+        return self.get(url).can_fetch(self.user_agent, url)
+
+    def crawl_delay(self, url):
+        """
+        Returns the Crawl-delay for the host of a URL, in seconds.
+
+        Returns:
+            float: Crawl delay, or None if robots.txt does not set one
+        """
+        parsed = urlparse(url)
+        self.get(url)
+        delays = self._delays.get(f"{parsed.scheme}://{parsed.netloc}", {})
+
+        agent = self.user_agent.lower()
+        for name, delay in delays.items():
+            if name != "*" and name in agent:
+                return delay
+        return delays.get("*")
+
+    def sitemaps(self, url):
+        """
+        Returns the sitemap URLs listed in robots.txt for the host of a URL.
+
+        Returns:
+            list: Sitemap URLs (empty if robots.txt lists none)
+        """
+        return list(self.get(url).site_maps() or [])
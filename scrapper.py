@@ -1,12 +1,14 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from bs4 import BeautifulSoup, UnicodeDammit
 from urllib.parse import urljoin, urlparse
+import threading
 import time
 import os
 import json
 from datetime import datetime
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import (
     SimpleDocTemplate,
@@ -15,20 +17,193 @@ from reportlab.platypus import (
     PageBreak,
     HRFlowable,
 )
-from reportlab.lib.enums import TA_JUSTIFY, TA_LEFT, TA_CENTER
-from reportlab.lib import colors
+
+try:
+    import lxml.html as lxml_html
+except ImportError:
+    lxml_html = None
+
+import http_client
+from crawl_frontier import CrawlFrontier
+from crawl_state import CrawlState
+from dedup import ContentDeduplicator
+from embedded_json import EmbeddedJSONExtractor
+from link_filter import LinkFilter, SeenIndex
+from merged_pdf import MergedPDFSink
+from metrics import JSONExporter, PrometheusExporter, get_metrics
+from output_sinks import create_sink
+from pdf_theme import PDFTheme
+from rate_limiter import HostRateLimiter
+from robots import RobotsCache
+from sitemap import LastmodStore, SitemapReader
+from response_cache import ResponseCache
+
+
+class StageStats:
+    """Collects per-stage counts and busy time for the pipelined crawl."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.max_queue_depth = 0
+
+    def record(self, stage, seconds):
+        count, busy = self.stages.get(stage, (0, 0.0))
+        self.stages[stage] = (count + 1, busy + seconds)
+
+    def observe_queue(self, depth):
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def report(self):
+        elapsed = time.perf_counter() - self.started
+        print(f"\n📊 Pipeline throughput ({elapsed:.1f}s wall):")
+        for stage, (count, busy) in self.stages.items():
+            rate = count / elapsed if elapsed > 0 else 0.0
+            avg = busy / count if count else 0.0
+            print(
+                f"   {stage:<7} {count:>6} pages  {rate:7.2f} pages/s  "
+                f"avg {avg * 1000:.0f} ms"
+            )
+        print(f"   max render queue depth: {self.max_queue_depth}")
+
+
+# Tags collected by the single-pass extraction in _parse_page
+EXTRACTED_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6", "p", "a"]
+# Elements whose text BeautifulSoup's get_text() leaves out
+NON_TEXT_TAGS = {"script", "style", "template"}
+
+# PDF renderer living in each process-pool worker, built once per process
+_render_scraper = None
+
+
+def _init_render_worker(output_dir):
+    global _render_scraper
+    _render_scraper = PDFWebScraper(delay=0)
+    _render_scraper.output_dir = output_dir
+
+
+def _render_pdf(data, filename):
+    _render_scraper.create_pdf(data, filename)
+
+
+def _lxml_text(element):
+    """
+    Yields the text pieces of an lxml element like BeautifulSoup's
+    get_text(): scripts, styles, templates and comments are left out.
+    """
+    if element.text:
+        yield element.text
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in NON_TEXT_TAGS:
+            yield from _lxml_text(child)
+        if child.tail:
+            yield child.tail
+
+
+def _seed_suffix(url):
+    """
+    Stable file name suffix of a sitemap seed, from its canonical URL.
+
+    12 hex digits (48 bits) keep collisions negligible even for sitemaps
+    with hundreds of thousands of pages.
+    """
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
 
 
 class PDFWebScraper:
-    def __init__(self, delay=0.5):
+    def __init__(
+        self,
+        delay=0.5,
+        concurrency=8,
+        max_per_host=4,
+        session=None,
+        cache=None,
+        state=None,
+        sinks=None,
+        render_pdf=True,
+        rate_limiter=None,
+        respect_robots=True,
+        dedup=None,
+        metrics=None,
+        exporters=None,
+        link_filter=None,
+        bloom_capacity=None,
+        sitemaps=False,
+        lastmods=None,
+        embedded_json=True,
+    ):
         """
         Initializes the scraper.
 
         Args:
-            delay: Delay between requests in seconds
+            delay: Initial delay between requests to the same host, in seconds
+            concurrency: Number of concurrent fetches in async mode
+            max_per_host: Maximum in-flight requests per host in async mode
+            session: requests.Session to use (defaults to the shared pooled
+                session from http_client)
+            cache: Optional ResponseCache for conditional GETs on re-crawls
+            state: Optional CrawlState checkpointing progress for resumes
+            sinks: Output sinks (see output_sinks) receiving every scraped
+                page as it is produced
+            render_pdf: Whether to write one PDF per page
+            rate_limiter: Per-host HostRateLimiter (defaults to one starting
+                at `delay` and adapting to server feedback)
+            respect_robots: Whether to honour robots.txt Crawl-delay
+            dedup: Optional ContentDeduplicator; when set, URLs are
+                canonicalized before the visited check and pages whose
+                content was already seen are not rendered or expanded
+            metrics: Metrics registry for stage latencies and counters
+                (defaults to the process-wide one from metrics.get_metrics)
+            exporters: Metrics exporters (see metrics) run at the end of
+                each scrape_all* call
+            link_filter: LinkFilter choosing the child URLs of each page
+                (defaults to one with no patterns and no fan-out cap,
+                canonicalizing with `dedup` when given)
+            bloom_capacity: Expected number of URLs per crawl; when set, the
+                visited-or-queued index uses Bloom filters instead of sets
+            sitemaps: Whether to seed each crawl with the pages listed in the
+                site's sitemaps (found through robots.txt or /sitemap.xml)
+            lastmods: Optional LastmodStore; with sitemaps, pages whose
+                lastmod has not changed since the previous crawl are skipped
+                (only per-page PDFs stay complete: consolidated sinks are
+                rewritten each run and would hold the changed pages alone)
+            embedded_json: Whether pages with few paragraphs get the content
+                of their embedded JSON (JSON-LD, Next.js / Nuxt state) added
         """
         self.delay = delay
-        self.visited_urls = set()
+        self.concurrency = concurrency
+        self.max_per_host = max_per_host
+        self.session = session or http_client.get_session()
+        self.cache = cache
+        self.state = state
+        self.sinks = sinks or []
+        self.render_pdf = render_pdf
+        self.dedup = dedup
+        self.metrics = metrics or get_metrics()
+        self.exporters = exporters or []
+        self.link_filter = link_filter or LinkFilter(
+            canonicalize=dedup.canonicalize if dedup else None
+        )
+        self.bloom_capacity = bloom_capacity
+        self.theme = PDFTheme()
+        self.robots = RobotsCache(session=self.session) if respect_robots else None
+        self.rate_limiter = rate_limiter or HostRateLimiter(
+            base_delay=delay, robots=self.robots
+        )
+        self.sitemaps = (
+            SitemapReader(
+                session=self.session,
+                robots=self.robots,
+                rate_limiter=self.rate_limiter,
+            )
+            if sitemaps
+            else None
+        )
+        self.lastmods = lastmods
+        self._seed_lastmods = {}
+        self.json_extractor = EmbeddedJSONExtractor() if embedded_json else None
+        self.visited_urls = SeenIndex(bloom_capacity)
+        self._emit_lock = threading.Lock()
         self.results = []
         self.output_dir = "webs"
 
@@ -74,68 +249,256 @@ class PDFWebScraper:
             return None
 
         self.visited_urls.add(url)
+        return self._fetch_page(url)
+
+    def _fetch_page(self, url, visited=None):
+        """
+        Fetches and parses a URL without touching the visited set.
+
+        Args:
+            url: URL to fetch
+            visited: Set the child URLs are filtered against (defaults to
+                self.visited_urls)
+
+        Returns:
+            dict: Scraped data, or a dict with an "error" key on failure
+        """
+        if visited is None:
+            visited = self.visited_urls
 
         try:
-            response = requests.get(
-                url,
-                timeout=10,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                },
-            )
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, "html.parser")
-
-            # Extract structured content
-            data = {
-                "url": url,
-                "title": soup.title.string if soup.title else "No title",
-                "headings": [],
-                "paragraphs": [],
-                "links": [],
-                "child_urls": [],
-            }
-
-            # Extract all headings (h1 to h6)
-            for i in range(1, 7):
-                for heading in soup.find_all(f"h{i}"):
-                    data["headings"].append(
-                        {"level": i, "text": heading.get_text(strip=True)}
-                    )
+            headers = self.cache.conditional_headers(url) if self.cache else {}
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, timeout=10, headers=headers)
+            except Exception as e:
+                self.rate_limiter.feedback(url, error=e)
+                self.metrics.error("fetch", e)
+                raise
+            latency = time.perf_counter() - start
+            self.rate_limiter.feedback(url, response=response, latency=latency)
+            self.metrics.observe("fetch", latency)
+            # Time to response headers: DNS, connect, TLS and server time
+            self.metrics.observe("ttfb", response.elapsed.total_seconds())
+            self.metrics.inc("bytes_fetched_total", http_client.wire_bytes(response))
+
+            if response.status_code == 304 and self.cache:
+                cached = self.cache.get(url)
+                if cached is not None:
+                    # Unchanged since the last run: skip parsing entirely
+                    cached["not_modified"] = True
+                    self.metrics.inc("pages_total", status="not_modified")
+                    return self._filter_child_urls(cached, visited)
+                response = self.session.get(url, timeout=10)
+
+            try:
+                response.raise_for_status()
+            except Exception as e:
+                self.metrics.error("fetch", e)
+                raise
+
+            with self.metrics.time("parse"):
+                data = self._parse_page(url, response.content)
+            if self.cache:
+                self.cache.put(url, response, data)
+            self.metrics.inc("pages_total", status="ok")
+            return self._filter_child_urls(data, visited)
+
+        except Exception as e:
+            print(f"⚠️  Error on {url}: {e}")
+            self.metrics.inc("pages_total", status="error")
+            return {"url": url, "error": str(e)}
+
+    def _filter_child_urls(self, data, visited):
+        """
+        Replaces a page's link targets with the child URLs worth crawling:
+        canonical, same-domain, allowed (by the patterns and, when
+        respected, robots.txt), not yet visited or queued and within the
+        fan-out cap (see LinkFilter).
+        """
+        links = data["child_urls"]
+        data["child_urls"] = self.link_filter.select(
+            data["url"],
+            links,
+            visited,
+            can_fetch=self.robots.can_fetch if self.robots else None,
+        )
+        self.metrics.inc("links_found_total", len(links))
+        self.metrics.inc("links_selected_total", len(data["child_urls"]))
+        return data
+
+    def _parse_page(self, url, content):
+        """
+        Extracts structured content from an HTML page.
+
+        The document is walked once, in order, collecting headings,
+        paragraphs and links together. lxml is used when installed, with
+        BeautifulSoup's html.parser as the fallback; both give the same
+        result. child_urls holds every link target; choosing the children
+        to crawl is left to the caller so the result can be cached.
+
+        Pages rendered client-side have little markup text; for those, the
+        JSON they embed is turned into headings and paragraphs as well
+        (see EmbeddedJSONExtractor).
+
+        Returns:
+            dict: Scraped data including titles, paragraphs, links and
+                "blocks" (headings and paragraphs in document order)
+        """
+        if lxml_html is not None:
+            title, elements = self._walk_lxml(content)
+        else:
+            title, elements = self._walk_soup(content)
+
+        # Extract structured content
+        data = {
+            "url": url,
+            "title": title if title is not None else "No title",
+            "headings": [],
+            "paragraphs": [],
+            "blocks": [],
+            "links": [],
+            "child_urls": [],
+        }
 
-            # Extract paragraphs
-            for p in soup.find_all("p"):
-                text = p.get_text(strip=True)
+        for tag, text, href in elements:
+            if tag == "a":
+                link_url = urljoin(url, href)
+                data["links"].append(
+                    {"text": text if text else "Link", "url": link_url}
+                )
+                data["child_urls"].append(link_url)
+            elif tag == "p":
                 if text:  # Only add non-empty paragraphs
                     data["paragraphs"].append(text)
+                    data["blocks"].append({"type": "paragraph", "text": text})
+            else:
+                level = int(tag[1])
+                data["headings"].append({"level": level, "text": text})
+                data["blocks"].append({"type": "heading", "level": level, "text": text})
 
-            # Extract links
-            for link in soup.find_all("a", href=True):
-                link_text = link.get_text(strip=True)
-                link_url = urljoin(url, link["href"])
-                data["links"].append(
-                    {"text": link_text if link_text else "Link", "url": link_url}
+        if self.json_extractor and self.json_extractor.needed(data):
+            self._add_embedded_json(data, content)
+
+        # Headings keep their historical grouping by level
+        data["headings"].sort(key=lambda heading: heading["level"])
+
+        return data
+
+    def _add_embedded_json(self, data, content):
+        """Appends the content of a page's embedded JSON to its data."""
+        blocks, sources = self.json_extractor.extract(content, data["paragraphs"])
+        if not blocks:
+            return
+
+        for block in blocks:
+            data["blocks"].append(block)
+            if block["type"] == "heading":
+                data["headings"].append(
+                    {"level": block["level"], "text": block["text"]}
                 )
+            else:
+                data["paragraphs"].append(block["text"])
+        data["embedded_json"] = sources
+        self.metrics.inc("embedded_json_pages_total")
 
-                # Check if it's a valid child URL (same domain)
-                parsed = urlparse(link_url)
-                if (
-                    parsed.scheme in ["http", "https"]
-                    and self._same_domain(url, link_url)
-                    and link_url not in self.visited_urls
-                ):
-                    data["child_urls"].append(link_url)
+    def _walk_soup(self, content):
+        """
+        Walks the document with BeautifulSoup (html.parser).
 
-            return data
+        Returns:
+            tuple: (title, [(tag, text, href), ...]) in document order
+        """
+        soup = BeautifulSoup(content, "html.parser")
+        title = soup.title.string if soup.title else None
+
+        elements = []
+        for element in soup.find_all(EXTRACTED_TAGS):
+            if element.name == "a":
+                if not element.has_attr("href"):
+                    continue
+                href = element["href"]
+            else:
+                href = None
+            elements.append((element.name, element.get_text(strip=True), href))
+        return title, elements
+
+    def _walk_lxml(self, content):
+        """
+        Walks the document with lxml, mirroring _walk_soup's output.
 
-        except Exception as e:
-            print(f"⚠️  Error on {url}: {e}")
-            return {"url": url, "error": str(e)}
+        Returns:
+            tuple: (title, [(tag, text, href), ...]) in document order
+        """
+        markup = UnicodeDammit(content, is_html=True).unicode_markup
+        try:
+            root = lxml_html.document_fromstring(markup)
+        except ValueError:
+            # Unicode strings with an XML encoding declaration are rejected
+            root = lxml_html.document_fromstring(content)
+
+        title_element = root.find(".//title")
+        title = None
+        if title_element is not None and len(title_element) == 0:
+            title = title_element.text
+
+        # BeautifulSoup gives no text to anything inside a <template>
+        templated = {
+            child for template in root.iter("template") for child in template.iter()
+        }
+
+        elements = []
+        for element in root.iter(EXTRACTED_TAGS):
+            href = element.get("href") if element.tag == "a" else None
+            if element.tag == "a" and href is None:
+                continue
+            # Same joining rule as BeautifulSoup's get_text(strip=True)
+            text = "".join(
+                piece.strip()
+                for piece in ([] if element in templated else _lxml_text(element))
+                if piece.strip()
+            )
+            elements.append((element.tag, text, href))
+        return title, elements
+
+    def _should_render(self, data, filename):
+        """
+        Returns False when PDF output is disabled, or when the page was not
+        modified since the last run and its PDF is already on disk under
+        the same name. Names follow the crawl position, so a file with this
+        name may hold another URL's page; only the name recorded in the
+        cache for this URL counts.
+        """
+        if not self.render_pdf or data.get("duplicate_of"):
+            return False
+        if not data.get("not_modified") or not self.cache:
+            return True
+        if self.cache.rendered_file(data["url"]) != filename:
+            return True
+        return not os.path.exists(os.path.join(self.output_dir, filename))
+
+    def _mark_rendered(self, data, filename):
+        """
+        Remembers which PDF a page was written to, once it is on disk, and
+        records the sitemap lastmod it was rendered from.
+        """
+        if "error" in data:
+            return
+        if self.cache:
+            self.cache.mark_rendered(data["url"], filename)
+        self._record_lastmod(data)
 
-    def _same_domain(self, url1, url2):
-        """Check if two URLs belong to the same domain."""
-        return urlparse(url1).netloc == urlparse(url2).netloc
+    def _record_lastmod(self, data):
+        """
+        Stores the sitemap lastmod of a page whose output is complete.
+
+        Only called once the PDF is written (or not needed), so a page whose
+        render failed or never ran is fetched again by the next
+        --only-changed run.
+        """
+        if self.lastmods and "error" not in data:
+            lastmod = self._seed_lastmods.pop(data["url"], None)
+            self.lastmods.record(data["url"], lastmod)
 
     def create_pdf(self, data, filename):
         """
@@ -157,200 +520,94 @@ class PDFWebScraper:
             bottomMargin=50,
         )
 
-        # Container for the 'Flowable' objects
-        story = []
+        with self.metrics.time("render"):
+            story = self.build_story(data)
 
-        # Define styles
-        styles = getSampleStyleSheet()
-
-        # Custom styles with better formatting
-        url_style = ParagraphStyle(
-            "URLStyle",
-            parent=styles["Normal"],
-            fontSize=10,
-            textColor=colors.HexColor("#666666"),
-            spaceAfter=6,
-            alignment=TA_LEFT,
-        )
+            # Pages with errors only get the header and the error message
+            if "error" in data:
+                doc.build(story)
+                return
 
-        title_style = ParagraphStyle(
-            "CustomTitle",
-            parent=styles["Title"],
-            fontSize=28,
-            textColor=colors.HexColor("#2C3E50"),
-            spaceAfter=20,
-            spaceBefore=10,
-            alignment=TA_LEFT,
-            leading=32,
-        )
+            # Build PDF
+            try:
+                doc.build(story)
+                print(f"   📄 PDF creado: {filename}")
+                self._mark_rendered(data, filename)
+            except Exception as e:
+                self.metrics.error("render", e)
+                print(f"   ❌ Error creando PDF {filename}: {e}")
 
-        # Heading styles with better hierarchy
-        heading_styles = {
-            1: ParagraphStyle(
-                "Heading1",
-                parent=styles["Heading1"],
-                fontSize=20,
-                textColor=colors.HexColor("#34495E"),
-                spaceAfter=12,
-                spaceBefore=20,
-                borderWidth=0,
-                borderPadding=0,
-                borderColor=colors.HexColor("#3498DB"),
-                borderRadius=0,
-                leading=24,
-            ),
-            2: ParagraphStyle(
-                "Heading2",
-                parent=styles["Heading2"],
-                fontSize=18,
-                textColor=colors.HexColor("#34495E"),
-                spaceAfter=10,
-                spaceBefore=16,
-                leading=22,
-            ),
-            3: ParagraphStyle(
-                "Heading3",
-                parent=styles["Heading3"],
-                fontSize=16,
-                textColor=colors.HexColor("#34495E"),
-                spaceAfter=8,
-                spaceBefore=12,
-                leading=20,
-            ),
-            4: ParagraphStyle(
-                "Heading4",
-                parent=styles["Heading4"],
-                fontSize=14,
-                textColor=colors.HexColor("#34495E"),
-                spaceAfter=6,
-                spaceBefore=10,
-                leading=18,
-            ),
-            5: ParagraphStyle(
-                "Heading5",
-                parent=styles["Heading5"],
-                fontSize=12,
-                textColor=colors.HexColor("#34495E"),
-                spaceAfter=4,
-                spaceBefore=8,
-                leading=16,
-            ),
-            6: ParagraphStyle(
-                "Heading6",
-                parent=styles["Heading6"],
-                fontSize=11,
-                textColor=colors.HexColor("#34495E"),
-                spaceAfter=4,
-                spaceBefore=6,
-                leading=14,
-            ),
-        }
+    def build_story(self, data):
+        """
+        Builds the flowables for a scraped page, as laid out by create_pdf.
 
-        paragraph_style = ParagraphStyle(
-            "CustomParagraph",
-            parent=styles["Normal"],
-            fontSize=11,
-            textColor=colors.HexColor("#2C3E50"),
-            alignment=TA_JUSTIFY,
-            spaceAfter=12,
-            leading=16,
-            firstLineIndent=0,
-        )
+        Args:
+            data: Dictionary containing scraped content
 
-        link_style = ParagraphStyle(
-            "LinkStyle",
-            parent=styles["Normal"],
-            textColor=colors.HexColor("#3498DB"),
-            fontSize=10,
-            leftIndent=20,
-            spaceAfter=4,
-        )
+        Returns:
+            list: ReportLab flowables
+        """
+        # Container for the 'Flowable' objects
+        story = []
 
-        section_header_style = ParagraphStyle(
-            "SectionHeader",
-            parent=styles["Heading2"],
-            fontSize=16,
-            textColor=colors.HexColor("#2C3E50"),
-            spaceAfter=12,
-            spaceBefore=24,
-            alignment=TA_LEFT,
-            borderWidth=1,
-            borderColor=colors.HexColor("#BDC3C7"),
-            borderPadding=10,
-            backColor=colors.HexColor("#ECF0F1"),
-        )
+        # Styles are precomputed once per scraper (see PDFTheme)
+        theme = self.theme
 
         # Add header with URL
-        story.append(Paragraph(f"<b>URL:</b> {data['url']}", url_style))
+        story.append(Paragraph(f"<b>URL:</b> {data['url']}", theme.url_style))
         story.append(Spacer(1, 4))
 
         # Add a line separator
-        from reportlab.platypus import HRFlowable
-
-        story.append(
-            HRFlowable(width="100%", thickness=1, color=colors.HexColor("#BDC3C7"))
-        )
+        story.append(HRFlowable(width="100%", thickness=1, color=theme.rule_color))
         story.append(Spacer(1, 12))
 
         # Add title
-        story.append(Paragraph(data.get("title", "Sin título"), title_style))
+        story.append(Paragraph(data.get("title", "Sin título"), theme.title_style))
 
         # Add error message if exists
         if "error" in data:
-            error_style = ParagraphStyle(
-                "ErrorStyle",
-                parent=styles["Normal"],
-                textColor=colors.red,
-                fontSize=12,
-                borderWidth=1,
-                borderColor=colors.red,
-                borderPadding=10,
-                backColor=colors.HexColor("#FFEBEE"),
-            )
-            story.append(Paragraph(f"<b>Error:</b> {data['error']}", error_style))
-            doc.build(story)
-            return
+            story.append(Paragraph(f"<b>Error:</b> {data['error']}", theme.error_style))
+            return story
 
         # Add main content section
         content_added = False
 
         # Group content by type for better organization
         if data.get("headings") or data.get("paragraphs"):
-            story.append(Paragraph("Contenido Principal", section_header_style))
+            story.append(Paragraph("Contenido Principal", theme.section_header_style))
             story.append(Spacer(1, 12))
 
-            # Create a mixed content list with headings and paragraphs
-            # This would require more complex logic to maintain document order
-            # For now, we'll keep them separate but well-formatted
-
-            # Add headings
-            if data.get("headings"):
-                for heading in data["headings"]:
-                    level = heading["level"]
-                    text = heading["text"]
-                    if text:
-                        # Clean and escape text for XML
-                        clean_text = self._clean_text_for_pdf(text)
-                        story.append(
-                            Paragraph(
-                                clean_text, heading_styles.get(level, heading_styles[3])
-                            )
-                        )
-                        content_added = True
-
-            # Add paragraphs
-            if data.get("paragraphs"):
-                for para in data["paragraphs"]:
-                    if para and len(para.strip()) > 0:
-                        # Clean and escape text for XML
-                        clean_text = self._clean_text_for_pdf(para)
-                        story.append(Paragraph(clean_text, paragraph_style))
-                        content_added = True
+            # Mixed content list with headings and paragraphs in document
+            # order; data without "blocks" keeps them separate
+            blocks = data.get("blocks")
+            if blocks is None:
+                blocks = [
+                    {"type": "heading", "level": h["level"], "text": h["text"]}
+                    for h in data.get("headings", [])
+                ] + [
+                    {"type": "paragraph", "text": p} for p in data.get("paragraphs", [])
+                ]
+
+            for block in blocks:
+                text = block["text"]
+                if not text or not text.strip():
+                    continue
+
+                # Clean and escape text for XML
+                clean_text = self._clean_text_for_pdf(text)
+                if block["type"] == "heading":
+                    style = theme.heading_styles.get(
+                        block["level"], theme.heading_styles[3]
+                    )
+                else:
+                    style = theme.paragraph_style
+                story.append(Paragraph(clean_text, style))
+                content_added = True
 
         # Add links section if there are links
         if data.get("links"):
             story.append(Spacer(1, 20))
-            story.append(Paragraph("Enlaces Encontrados", section_header_style))
+            story.append(Paragraph("Enlaces Encontrados", theme.section_header_style))
             story.append(Spacer(1, 12))
 
             # Group links by text to avoid duplicates
@@ -374,53 +631,30 @@ class PDFWebScraper:
                     else:
                         link_display = f"• <b>{self._clean_text_for_pdf(link_text)}:</b> {link_url}"
 
-                    story.append(Paragraph(link_display, link_style))
+                    story.append(Paragraph(link_display, theme.link_style))
 
         # If no content was added, add a message
         if not content_added and not data.get("links"):
-            no_content_style = ParagraphStyle(
-                "NoContent",
-                parent=styles["Normal"],
-                fontSize=12,
-                textColor=colors.HexColor("#7F8C8D"),
-                alignment=TA_CENTER,
-                spaceAfter=12,
-                spaceBefore=12,
-            )
             story.append(
                 Paragraph(
                     "No se encontró contenido estructurado en esta página.",
-                    no_content_style,
+                    theme.no_content_style,
                 )
             )
 
         # Add footer with timestamp
         story.append(Spacer(1, 30))
-        story.append(
-            HRFlowable(width="100%", thickness=0.5, color=colors.HexColor("#BDC3C7"))
-        )
+        story.append(HRFlowable(width="100%", thickness=0.5, color=theme.rule_color))
 
-        footer_style = ParagraphStyle(
-            "Footer",
-            parent=styles["Normal"],
-            fontSize=8,
-            textColor=colors.HexColor("#7F8C8D"),
-            alignment=TA_CENTER,
-        )
         story.append(Spacer(1, 6))
         story.append(
             Paragraph(
                 f"Generado el {datetime.now().strftime('%d/%m/%Y a las %H:%M:%S')}",
-                footer_style,
+                theme.footer_style,
             )
         )
 
-        # Build PDF
-        try:
-            doc.build(story)
-            print(f"   📄 PDF creado: {filename}")
-        except Exception as e:
-            print(f"   ❌ Error creando PDF {filename}: {e}")
+        return story
 
     def _clean_text_for_pdf(self, text):
         """
@@ -460,13 +694,18 @@ class PDFWebScraper:
             parent_index: Index string for naming (e.g., "1", "1-2")
         """
         if current_depth >= max_depth or url in self.visited_urls:
+            if self.state:
+                self.state.discard(parent_index)
             return
 
-        # Scrape current URL
+        # Scrape current URL, once its host's rate allows it
+        self.rate_limiter.acquire(url)
         data = self.scrape_url(url)
         if not data:
             return
 
+        self._emit(data, parent_index, current_depth)
+
         # Generate PDF filename
         if current_depth == 0:
             # Parent URL
@@ -476,34 +715,235 @@ class PDFWebScraper:
             pdf_filename = f"web{parent_index}.pdf"
 
         # Create PDF for this page
-        self.create_pdf(data, pdf_filename)
+        if self._should_render(data, pdf_filename):
+            self.create_pdf(data, pdf_filename)
+        else:
+            self._record_lastmod(data)
+
+        children = self._child_entries(
+            data, parent_index, current_depth, max_depth, self.visited_urls
+        )
+        if self.state:
+            self.state.complete(parent_index, url, pdf_filename, children)
 
         # Process child URLs if not at max depth
-        if current_depth < max_depth - 1 and "child_urls" in data:
-            for idx, child_url in enumerate(data["child_urls"], 1):
-                time.sleep(self.delay)
+        for child_index, child_url, child_depth in children:
+            self.scrape_recursive(child_url, max_depth, child_depth, child_index)
 
-                # Create index for child
-                if current_depth == 0:
-                    child_index = f"{parent_index}-{idx}"
-                else:
-                    child_index = f"{parent_index}-{idx}"
+    def _child_entries(self, data, index, depth, max_depth, visited):
+        """
+        Returns the (index, url, depth) entries to schedule for a page's
+        children, or an empty list at the maximum depth. Each child is
+        claimed in `visited` as it is scheduled, so a URL linked from
+        several pages is only queued once.
+        """
+        if depth >= max_depth - 1 or "child_urls" not in data:
+            return []
+        if data.get("duplicate_of"):
+            # Same content as a page already crawled: same links too
+            return []
+        claim = getattr(visited, "claim", lambda url: True)
+        return [
+            (f"{index}-{idx}", child_url, depth + 1)
+            for idx, child_url in enumerate(data["child_urls"], 1)
+            if claim(child_url)
+        ]
+
+    async def scrape_recursive_async(
+        self,
+        url,
+        max_depth,
+        parent_index="",
+        render_queue=None,
+        stats=None,
+        entries=None,
+        visited=None,
+    ):
+        """
+        Concurrent counterpart of scrape_recursive.
 
-                self.scrape_recursive(
-                    child_url, max_depth, current_depth + 1, child_index
-                )
+        Pages are pulled from a frontier queue by `self.concurrency` workers.
+        Instead of a global sleep, each host gets a politeness budget: request
+        starts are paced by the per-host rate limiter and at most
+        `self.max_per_host` requests are in flight. PDF names follow the same webX-Y-Z scheme,
+        where each child keeps its position in the parent's child_urls.
 
-    def scrape_all(self, config_file="urls.json"):
+        Args:
+            url: Root URL to scrape
+            max_depth: Maximum depth to scrape
+            parent_index: Index string for naming (e.g., "1")
+            render_queue: Optional bounded asyncio.Queue; when given, scraped
+                (data, filename, checkpoint) tuples are pushed there instead
+                of being rendered by the fetch workers
+            stats: Optional StageStats to record fetch timings in
+            entries: Optional (index, url, depth) entries to start from
+                instead of the root URL (used when resuming)
+            visited: Visited set for this crawl (defaults to
+                self.visited_urls)
         """
-        Main method to process all URLs from configuration file.
+        if visited is None:
+            visited = self.visited_urls
+
+        frontier = asyncio.Queue()
+        for index, entry_url, depth in entries or [(parent_index, url, 0)]:
+            frontier.put_nowait((entry_url, depth, index))
+        host_semaphores = {}
+
+        async def crawl_one(page_url, depth, index):
+            if depth >= max_depth or page_url in visited:
+                if self.state:
+                    self.state.discard(index)
+                return
+
+            # Claim the URL before fetching so no other worker picks it up
+            visited.add(page_url)
+
+            host = urlparse(page_url).netloc
+            semaphore = host_semaphores.setdefault(
+                host, asyncio.Semaphore(self.max_per_host)
+            )
+            async with semaphore:
+                await self.rate_limiter.acquire_async(page_url)
+                start = time.perf_counter()
+                data = await asyncio.to_thread(self._fetch_page, page_url, visited)
+                if stats is not None:
+                    stats.record("fetch", time.perf_counter() - start)
+
+            # Sinks may lay out PDF pages (merged output): keep that work
+            # off the event loop so fetches continue meanwhile
+            await asyncio.to_thread(self._emit, data, index, depth)
+
+            pdf_filename = f"web{index}.pdf"
+            children = self._child_entries(data, index, depth, max_depth, visited)
+            checkpoint = (index, page_url, pdf_filename, children)
+            if not self._should_render(data, pdf_filename):
+                self._record_lastmod(data)
+                self._checkpoint(checkpoint)
+            elif render_queue is not None:
+                # Blocks while the renderers are behind (backpressure); the
+                # page is checkpointed once its PDF has been written
+                await render_queue.put((data, pdf_filename, checkpoint))
+                if stats is not None:
+                    stats.observe_queue(render_queue.qsize())
+            else:
+                await asyncio.to_thread(self.create_pdf, data, pdf_filename)
+                self._checkpoint(checkpoint)
+
+            for child_index, child_url, child_depth in children:
+                frontier.put_nowait((child_url, child_depth, child_index))
+
+        async def worker():
+            while True:
+                page_url, depth, index = await frontier.get()
+                try:
+                    await crawl_one(page_url, depth, index)
+                except Exception as e:
+                    print(f"⚠️  Error on {page_url}: {e}")
+                finally:
+                    frontier.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        await frontier.join()
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def _emit(self, data, index, depth):
         """
-        configs = self.read_urls_json(config_file)
-        if not configs:
-            return
+        Streams a scraped page to the output sinks, after checking it
+        against the content already seen when deduplication is enabled.
+        Calls are serialized, so it can run in worker threads.
+        """
+        with self._emit_lock:
+            self._emit_locked(data, index, depth)
+
+    def _emit_locked(self, data, index, depth):
+        if self.dedup and "error" not in data:
+            original = self.dedup.check(data, f"web{index}.pdf")
+            if original:
+                data["duplicate_of"] = original
+                print(f"   🔁 web{index}.pdf duplicates {original}, not rendered")
+
+        for sink in self.sinks:
+            sink.write(data, index, depth)
+
+    def _checkpoint(self, checkpoint):
+        """Records a processed page in the crawl state, if any."""
+        if self.state:
+            self.state.complete(*checkpoint)
+
+    async def scrape_recursive_pipelined(
+        self,
+        url,
+        max_depth,
+        parent_index,
+        executor,
+        workers,
+        queue_size,
+        stats,
+        entries=None,
+        visited=None,
+    ):
+        """
+        Runs scrape_recursive_async with PDF rendering decoupled from fetching.
 
-        print(f"🚀 Starting PDF web scraping...")
-        print(f"📁 Output directory: {self.output_dir}")
+        Fetch workers push scraped pages onto a bounded queue that is drained
+        by `workers` renderer tasks, each handing pages to the process pool.
 
+        Args:
+            url: Root URL to scrape
+            max_depth: Maximum depth to scrape
+            parent_index: Index string for naming (e.g., "1")
+            executor: ProcessPoolExecutor running _render_pdf
+            workers: Number of renderer tasks (one per pool process)
+            queue_size: Maximum pages waiting to be rendered
+            stats: StageStats collecting per-stage throughput
+            entries: Optional (index, url, depth) entries to resume from
+            visited: Visited set for this crawl (defaults to
+                self.visited_urls)
+        """
+        loop = asyncio.get_running_loop()
+        render_queue = asyncio.Queue(maxsize=queue_size)
+
+        async def renderer():
+            while True:
+                data, filename, checkpoint = await render_queue.get()
+                try:
+                    start = time.perf_counter()
+                    await loop.run_in_executor(executor, _render_pdf, data, filename)
+                    elapsed = time.perf_counter() - start
+                    stats.record("render", elapsed)
+                    # Workers have their own registries: record it here
+                    self.metrics.observe("render", elapsed)
+                    self._mark_rendered(data, filename)
+                    self._checkpoint(checkpoint)
+                except Exception as e:
+                    self.metrics.error("render", e)
+                    print(f"   ❌ Error creando PDF {filename}: {e}")
+                finally:
+                    render_queue.task_done()
+
+        renderers = [asyncio.create_task(renderer()) for _ in range(workers)]
+        await self.scrape_recursive_async(
+            url,
+            max_depth,
+            parent_index,
+            render_queue=render_queue,
+            stats=stats,
+            entries=entries,
+            visited=visited,
+        )
+        await render_queue.join()
+        for task in renderers:
+            task.cancel()
+        await asyncio.gather(*renderers, return_exceptions=True)
+
+    def _iter_configs(self, configs, resume=False):
+        """
+        Yields (index, url, depth) for each valid configuration, printing
+        progress and resetting the visited set between configurations.
+        When resuming, configurations already completed are skipped.
+        """
         for idx, config in enumerate(configs, 1):
             url = config.get("url")
             depth = config.get("profundidad", 1)
@@ -512,6 +952,13 @@ class PDFWebScraper:
                 print(f"⚠️  Skipping config {idx}: No URL specified")
                 continue
 
+            if self.dedup:
+                url = self.dedup.canonicalize(url)
+
+            if resume and self.state and self.state.is_done(str(idx), url):
+                print(f"\n⏭️  Config {idx} already completed, skipping")
+                continue
+
             print(f"\n📍 Processing config {idx}/{len(configs)}:")
             print(f"   URL: {url}")
             print(f"   Depth: {depth}")
@@ -519,13 +966,317 @@ class PDFWebScraper:
             # Reset visited URLs for each parent configuration
             self.visited_urls.clear()
 
-            # Start recursive scraping
-            self.scrape_recursive(url, depth, parent_index=str(idx))
+            yield idx, url, depth
+
+    def _finish_run(self):
+        """Closes the output sinks and prints the end-of-run summary."""
+        for sink in self.sinks:
+            sink.close()
+            print(f"🗂️  Output written: {sink.path}")
+        self.sinks = []
+
+        if self.cache:
+            self.cache.report()
 
-            time.sleep(self.delay)
+        for exporter in self.exporters:
+            exporter.export(self.metrics)
+
+        if self.dedup and self.dedup.duplicates:
+            path = os.path.join(self.output_dir, "duplicates.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.dedup.duplicates, f, indent=2, ensure_ascii=False)
+            print(f"🔁 {len(self.dedup.duplicates)} duplicate pages, see {path}")
 
         print(f"\n✅ Scraping completed!")
-        print(f"📄 PDFs saved in: {self.output_dir}/")
+        if self.render_pdf:
+            print(f"📄 PDFs saved in: {self.output_dir}/")
+
+    def _start_entries(self, root, url, resume, visited=None, max_depth=1):
+        """
+        Returns the (index, url, depth) entries to crawl for a configuration.
+
+        Without a crawl state this is just the root page. With one, progress
+        is checkpointed and, when resuming, the stored visited set (into
+        `visited`, by default self.visited_urls) and pending pages are
+        restored. With sitemaps enabled, the sitemap pages follow, claimed
+        in `visited` so link discovery does not queue them again.
+        """
+        if visited is None:
+            visited = self.visited_urls
+
+        if not self.state:
+            entries = [(root, url, 0)]
+        else:
+            entries = self.state.start_config(root, url, resume)
+            if resume:
+                visited.update(self.state.visited(root))
+                if visited:
+                    print(
+                        f"   ↩️  Resuming config {root}: {len(visited)} pages done, "
+                        f"{len(entries)} pending"
+                    )
+
+        if self.sitemaps:
+            claim = getattr(visited, "claim", lambda page_url: True)
+            seeds, unchanged = self._sitemap_entries(root, url, max_depth)
+            for page_url in unchanged:
+                claim(page_url)
+            entries += [entry for entry in seeds if claim(entry[1])]
+        return entries
+
+    def _sitemap_entries(self, root, url, max_depth):
+        """
+        Lists the sitemap pages of a configuration's site as crawl entries.
+
+        Pages are canonicalized and filtered like links (allow / deny
+        patterns, robots.txt when respected). They are crawled at the last
+        depth, so their own links are not followed: the sitemap already
+        lists the site. Pages whose lastmod did not move since the previous
+        crawl (see LastmodStore) are returned apart so they can be skipped.
+
+        Seeds are named after a hash of their canonical URL, not their
+        position in the sitemap, so a page keeps its file name when pages
+        are added or removed and a partial re-crawl never writes over
+        another page's PDF.
+
+        Returns:
+            tuple: ([(index, url, depth), ...], [unchanged url, ...])
+        """
+        root_url = self.link_filter.canonical(url)
+        depth = max(max_depth - 1, 0)
+        entries = []
+        unchanged = []
+        seen = set()
+        for loc, lastmod in self.sitemaps.iter_pages(url):
+            page_url = self.link_filter.canonical(loc)
+            if page_url == root_url or page_url in seen:
+                continue
+            seen.add(page_url)
+            if not self.link_filter.allowed(page_url):
+                continue
+            if self.robots and not self.robots.can_fetch(page_url):
+                continue
+
+            if self.lastmods and not self.lastmods.changed(page_url, lastmod):
+                unchanged.append(page_url)
+                continue
+            self._seed_lastmods[page_url] = lastmod
+            entries.append((f"{root}-s{_seed_suffix(page_url)}", page_url, depth))
+
+        print(
+            f"   🗺️  Sitemap: {len(entries)} pages seeded"
+            + (f", {len(unchanged)} unchanged since last crawl" if unchanged else "")
+        )
+        self.metrics.inc("sitemap_pages_total", len(entries), status="seeded")
+        self.metrics.inc("sitemap_pages_total", len(unchanged), status="unchanged")
+        return entries, unchanged
+
+    def scrape_bfs(
+        self,
+        url,
+        max_depth,
+        parent_index="",
+        max_pages=None,
+        max_per_depth=None,
+        memory_limit=10000,
+    ):
+        """
+        Breadth-first, iterative counterpart of scrape_recursive.
+
+        Shallow pages are fetched first and no call stack grows with depth.
+        Deduplication is done by the frontier, which spills queued entries
+        and seen URLs to SQLite past memory_limit, so the visited set is not
+        used. PDF names follow the same webX-Y-Z scheme.
+
+        Args:
+            url: Root URL to scrape
+            max_depth: Maximum depth to scrape
+            parent_index: Index string for naming (e.g., "1")
+            max_pages: Stop after fetching this many pages
+            max_per_depth: Maximum pages queued per depth level
+            memory_limit: Frontier entries kept in memory before spilling
+        """
+        frontier = CrawlFrontier(memory_limit=memory_limit, max_per_depth=max_per_depth)
+        frontier.push(url, 0, parent_index)
+        if self.sitemaps:
+            seeds, unchanged = self._sitemap_entries(parent_index, url, max_depth)
+            for page_url in unchanged:
+                frontier.mark_seen(page_url)
+            for index, page_url, depth in seeds:
+                frontier.push(page_url, depth, index)
+        pages = 0
+
+        try:
+            while True:
+                entry = frontier.pop()
+                if entry is None:
+                    break
+                if max_pages is not None and pages >= max_pages:
+                    print(f"   ⏹️  Page limit reached ({max_pages})")
+                    break
+
+                page_url, depth, index = entry
+                self.rate_limiter.acquire(page_url)
+                data = self._fetch_page(page_url)
+                pages += 1
+                self._emit(data, index, depth)
+
+                pdf_filename = f"web{index}.pdf"
+                if self._should_render(data, pdf_filename):
+                    self.create_pdf(data, pdf_filename)
+                else:
+                    self._record_lastmod(data)
+
+                # The frontier dedups, so every child is offered to it
+                for child_index, child_url, child_depth in self._child_entries(
+                    data, index, depth, max_depth, ()
+                ):
+                    frontier.push(child_url, child_depth, child_index)
+        finally:
+            frontier.close()
+
+    def scrape_all(self, config_file="urls.json", resume=False):
+        """
+        Main method to process all URLs from configuration file.
+
+        Args:
+            config_file: JSON configuration file
+            resume: Continue from the checkpoints in self.state instead of
+                starting over
+        """
+        configs = self.read_urls_json(config_file)
+        if not configs:
+            return
+
+        print(f"🚀 Starting PDF web scraping...")
+        print(f"📁 Output directory: {self.output_dir}")
+
+        for idx, url, depth in self._iter_configs(configs, resume):
+            # Start recursive scraping (from the pending pages when resuming)
+            for index, page_url, page_depth in self._start_entries(
+                str(idx), url, resume, max_depth=depth
+            ):
+                self.scrape_recursive(page_url, depth, page_depth, index)
+
+            if self.state:
+                self.state.finish_config(str(idx))
+
+        self._finish_run()
+
+    def scrape_all_async(
+        self,
+        config_file="urls.json",
+        render_processes=None,
+        render_queue_size=32,
+        resume=False,
+        parallel=False,
+    ):
+        """
+        Same as scrape_all, but each configuration is crawled with the
+        concurrent engine (see scrape_recursive_async).
+
+        Args:
+            config_file: JSON configuration file
+            render_processes: If set, PDFs are rendered in a process pool of
+                this size, fed through a bounded queue (pipelined mode)
+            render_queue_size: Maximum scraped pages waiting to be rendered
+                before fetchers are paused
+            resume: Continue from the checkpoints in self.state
+            parallel: Crawl all configurations at the same time, each with
+                its own visited set and workers; the rate limiter keeps each
+                host at its own safe rate
+        """
+        configs = self.read_urls_json(config_file)
+        if not configs:
+            return
+
+        print(f"🚀 Starting async PDF web scraping ({self.concurrency} workers)...")
+        print(f"📁 Output directory: {self.output_dir}")
+
+        executor = None
+        stats = None
+        if render_processes:
+            print(f"🧵 Rendering PDFs in {render_processes} processes")
+            executor = ProcessPoolExecutor(
+                max_workers=render_processes,
+                initializer=_init_render_worker,
+                initargs=(self.output_dir,),
+            )
+            stats = StageStats()
+
+        async def crawl_config(idx, url, depth, visited):
+            entries = self._start_entries(
+                str(idx), url, resume, visited, max_depth=depth
+            )
+            if executor is not None:
+                await self.scrape_recursive_pipelined(
+                    url,
+                    depth,
+                    str(idx),
+                    executor,
+                    render_processes,
+                    render_queue_size,
+                    stats,
+                    entries=entries,
+                    visited=visited,
+                )
+            else:
+                await self.scrape_recursive_async(
+                    url, depth, parent_index=str(idx), entries=entries, visited=visited
+                )
+
+            if self.state:
+                self.state.finish_config(str(idx))
+
+        async def crawl_parallel(jobs):
+            await asyncio.gather(
+                *(
+                    crawl_config(idx, url, depth, SeenIndex(self.bloom_capacity))
+                    for idx, url, depth in jobs
+                )
+            )
+
+        if parallel:
+            asyncio.run(crawl_parallel(list(self._iter_configs(configs, resume))))
+        else:
+            for idx, url, depth in self._iter_configs(configs, resume):
+                asyncio.run(crawl_config(idx, url, depth, self.visited_urls))
+
+        if executor is not None:
+            executor.shutdown()
+            stats.report()
+
+        self._finish_run()
+
+    def scrape_all_bfs(
+        self,
+        config_file="urls.json",
+        max_pages=None,
+        max_per_depth=None,
+        memory_limit=10000,
+    ):
+        """
+        Same as scrape_all, but each configuration is crawled breadth-first
+        with a bounded-memory frontier (see scrape_bfs).
+        """
+        configs = self.read_urls_json(config_file)
+        if not configs:
+            return
+
+        print(f"🚀 Starting breadth-first PDF web scraping...")
+        print(f"📁 Output directory: {self.output_dir}")
+
+        for idx, url, depth in self._iter_configs(configs):
+            self.scrape_bfs(
+                url,
+                depth,
+                parent_index=str(idx),
+                max_pages=max_pages,
+                max_per_depth=max_per_depth,
+                memory_limit=memory_limit,
+            )
+
+        self._finish_run()
 
 
 def create_example_json(filename="urls.json"):
@@ -542,6 +1293,133 @@ def create_example_json(filename="urls.json"):
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scrape URLs from urls.json into PDFs")
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Use the concurrent crawl engine",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Concurrent fetches in async mode"
+    )
+    parser.add_argument(
+        "--delay", type=float, default=0.5, help="Delay between requests (seconds)"
+    )
+    parser.add_argument(
+        "--render-processes",
+        type=int,
+        default=None,
+        help="Render PDFs in a process pool of this size (async mode only)",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Revalidate pages with conditional GETs and skip unchanged ones",
+    )
+    parser.add_argument(
+        "--cache-size-mb", type=int, default=256, help="HTTP cache size cap in MB"
+    )
+    parser.add_argument(
+        "--bfs", action="store_true", help="Crawl breadth-first with a bounded frontier"
+    )
+    parser.add_argument(
+        "--max-pages", type=int, default=None, help="Page limit per config (BFS)"
+    )
+    parser.add_argument(
+        "--max-per-depth", type=int, default=None, help="Page limit per depth (BFS)"
+    )
+    parser.add_argument(
+        "--frontier-memory",
+        type=int,
+        default=10000,
+        help="Frontier entries kept in memory before spilling to disk (BFS)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Checkpoint crawl progress so the run can be resumed",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its checkpoints",
+    )
+    parser.add_argument(
+        "--formats",
+        default="pdf",
+        help=(
+            "Comma-separated outputs: pdf, merged (one PDF per config), "
+            "jsonl, json (nested), parquet"
+        ),
+    )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Crawl all configs at the same time, each host at its own rate (async)",
+    )
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Canonicalize URLs and skip pages with already seen content",
+    )
+    parser.add_argument(
+        "--allow",
+        action="append",
+        default=None,
+        help="Only follow links matching this regex (repeatable)",
+    )
+    parser.add_argument(
+        "--deny",
+        action="append",
+        default=None,
+        help="Never follow links matching this regex (repeatable)",
+    )
+    parser.add_argument(
+        "--max-links-per-page",
+        type=int,
+        default=None,
+        help="Follow at most this many new links from each page",
+    )
+    parser.add_argument(
+        "--bloom-capacity",
+        type=int,
+        default=None,
+        help="Track seen URLs in Bloom filters sized for this many URLs",
+    )
+    parser.add_argument(
+        "--sitemaps",
+        action="store_true",
+        help="Seed each crawl with the pages listed in the site's sitemaps",
+    )
+    parser.add_argument(
+        "--only-changed",
+        action="store_true",
+        help=(
+            "Skip sitemap pages whose lastmod is unchanged since the last run "
+            "(per-page PDFs only)"
+        ),
+    )
+    parser.add_argument(
+        "--no-embedded-json",
+        action="store_true",
+        help="Do not extract content from embedded JSON on thin pages",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        default=None,
+        help="Write a JSON summary of stage timings and counters to this file",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on this port while the crawl runs",
+    )
+    args = parser.parse_args()
+
     # Check if configuration file exists
     if not os.path.exists("urls.json"):
         print("⚠️  Configuration file not found. Creating example...")
@@ -549,5 +1427,79 @@ if __name__ == "__main__":
         print("Please edit urls.json with your URLs and run again.")
     else:
         # Create scraper instance and run
-        scraper = PDFWebScraper()
-        scraper.scrape_all()
+        formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+        if args.only_changed and set(formats) - {"pdf"}:
+            # The other outputs are rewritten from scratch on every run, so
+            # they would only hold the pages that changed
+            parser.error(
+                "--only-changed works with --formats pdf only: merged, jsonl, "
+                "json and parquet outputs are rewritten on each run and would "
+                "lose the unchanged pages"
+            )
+        dedup = ContentDeduplicator() if args.dedup else None
+        scraper = PDFWebScraper(
+            delay=args.delay,
+            concurrency=args.concurrency,
+            render_pdf="pdf" in formats,
+            dedup=dedup,
+            link_filter=LinkFilter(
+                allow=args.allow,
+                deny=args.deny,
+                max_per_page=args.max_links_per_page,
+                canonicalize=dedup.canonicalize if dedup else None,
+            ),
+            bloom_capacity=args.bloom_capacity,
+            sitemaps=args.sitemaps or args.only_changed,
+            embedded_json=not args.no_embedded_json,
+        )
+        scraper.sinks = [
+            (
+                MergedPDFSink(scraper)
+                if fmt == "merged"
+                else create_sink(fmt, os.path.join(scraper.output_dir, "scraping"))
+            )
+            for fmt in formats
+            if fmt != "pdf"
+        ]
+        if args.cache:
+            scraper.cache = ResponseCache(
+                os.path.join(scraper.output_dir, ".http_cache.sqlite"),
+                max_bytes=args.cache_size_mb * 1024 * 1024,
+            )
+        if args.checkpoint or args.resume:
+            scraper.state = CrawlState(
+                os.path.join(scraper.output_dir, ".crawl_state.sqlite")
+            )
+        if args.only_changed:
+            scraper.lastmods = LastmodStore(
+                os.path.join(scraper.output_dir, ".sitemap_lastmod.sqlite")
+            )
+        if args.metrics_json:
+            scraper.exporters.append(JSONExporter(args.metrics_json))
+        if args.metrics_port is not None:
+            scraper.exporters.append(
+                PrometheusExporter(scraper.metrics, port=args.metrics_port)
+            )
+        try:
+            if args.bfs:
+                scraper.scrape_all_bfs(
+                    max_pages=args.max_pages,
+                    max_per_depth=args.max_per_depth,
+                    memory_limit=args.frontier_memory,
+                )
+            elif args.use_async:
+                scraper.scrape_all_async(
+                    render_processes=args.render_processes,
+                    resume=args.resume,
+                    parallel=args.parallel,
+                )
+            else:
+                scraper.scrape_all(resume=args.resume)
+        finally:
+            # Flush the last checkpoint batch, also on Ctrl+C
+            if scraper.state:
+                scraper.state.close()
+            if scraper.lastmods:
+                scraper.lastmods.close()
+            for exporter in scraper.exporters:
+                exporter.close()
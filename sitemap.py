@@ -0,0 +1,211 @@
+import io
+import sqlite3
+import threading
+import xml.etree.ElementTree as ET
+import zlib
+from datetime import datetime, timezone
+from urllib.parse import urljoin, urlsplit
+
+import http_client
+from robots import RobotsCache
+
+# Sitemaps are capped at 50 MB uncompressed by the protocol
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def parse_lastmod(value):
+    """
+    Parses a W3C datetime as used in <lastmod> (2024, 2024-05,
+    2024-05-01, 2024-05-01T10:00:00+02:00, ...).
+
+    Returns:
+        datetime: Timezone-aware datetime (UTC when no offset is given),
+            or None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        for fmt in ("%Y-%m", "%Y"):
+            try:
+                parsed = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _decompress(content):
+    """Inflates gzip content (.xml.gz sitemaps), up to MAX_SITEMAP_BYTES."""
+    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    data = inflater.decompress(content, MAX_SITEMAP_BYTES + 1)
+    if len(data) > MAX_SITEMAP_BYTES:
+        raise ValueError("sitemap larger than 50 MB once decompressed")
+    return data
+
+
+def parse_sitemap(content):
+    """
+    Parses a sitemap or sitemap index, gzipped or not.
+
+    Tags are matched without their namespace, so sitemaps declaring a
+    wrong or missing xmlns are read as well.
+
+    Returns:
+        tuple: (pages, sitemaps), each a list of (loc, lastmod) with lastmod
+            a datetime or None
+    """
+    if content[:2] == GZIP_MAGIC:
+        content = _decompress(content)
+
+    pages = []
+    sitemaps = []
+    loc = lastmod = None
+    for _, element in ET.iterparse(io.BytesIO(content)):
+        tag = element.tag.rsplit("}", 1)[-1]
+        if tag == "loc":
+            loc = (element.text or "").strip()
+        elif tag == "lastmod":
+            lastmod = parse_lastmod(element.text)
+        elif tag in ("url", "sitemap"):
+            if loc:
+                (pages if tag == "url" else sitemaps).append((loc, lastmod))
+            loc = lastmod = None
+            element.clear()
+    return pages, sitemaps
+
+
+class SitemapReader:
+    """
+    Discovers the pages of a site from its sitemaps.
+
+    Sitemaps are taken from the Sitemap: lines of robots.txt, falling back
+    to /sitemap.xml, and sitemap indexes are followed (each sitemap is read
+    once). Only pages on the same host as the start URL are returned.
+    """
+
+    def __init__(
+        self, session=None, robots=None, rate_limiter=None, timeout=10, max_sitemaps=500
+    ):
+        """
+        Args:
+            session: requests.Session to download with (defaults to the
+                shared session from http_client)
+            robots: RobotsCache to read Sitemap: lines from (one is created
+                if not given)
+            rate_limiter: Optional HostRateLimiter pacing the downloads
+            timeout: Timeout per sitemap request, in seconds
+            max_sitemaps: Maximum sitemap files read per site
+        """
+        self.session = session or http_client.get_session()
+        self.robots = robots or RobotsCache(session=self.session)
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.max_sitemaps = max_sitemaps
+        self._lock = threading.Lock()
+
+    def sitemap_urls(self, url):
+        """
+        Returns the sitemaps to start from for the site of a URL.
+
+        Returns:
+            list: Sitemap URLs
+        """
+        listed = self.robots.sitemaps(url)
+        return listed or [urljoin(url, "/sitemap.xml")]
+
+    def _fetch(self, sitemap_url):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(sitemap_url)
+        response = self.session.get(sitemap_url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+
+    def iter_pages(self, url):
+        """
+        Yields the pages listed in the sitemaps of a site.
+
+        Unreachable or malformed sitemaps are reported and skipped.
+
+        Yields:
+            tuple: (loc, lastmod) with lastmod a datetime or None
+        """
+        host = urlsplit(url).netloc
+        pending = list(self.sitemap_urls(url))
+        read = set()
+        while pending and len(read) < self.max_sitemaps:
+            sitemap_url = pending.pop(0)
+            if sitemap_url in read:
+                continue
+            read.add(sitemap_url)
+
+            try:
+                pages, sitemaps = parse_sitemap(self._fetch(sitemap_url))
+            except Exception as e:
+                print(f"⚠️  Sitemap {sitemap_url} skipped: {e}")
+                continue
+
+            pending.extend(loc for loc, _ in sitemaps)
+            for loc, lastmod in pages:
+                if urlsplit(loc).netloc == host:
+                    yield loc, lastmod
+
+
+class LastmodStore:
+    """
+    Remembers, per URL, the sitemap lastmod of the copy crawled last, so a
+    re-crawl only fetches pages whose lastmod moved forward.
+    """
+
+    def __init__(self, path="webs/.sitemap_lastmod.sqlite"):
+        """
+        Args:
+            path: SQLite file holding the lastmod of each crawled URL
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS lastmod (url TEXT PRIMARY KEY, lastmod TEXT)"
+        )
+        self._conn.commit()
+
+    def changed(self, url, lastmod):
+        """
+        Returns True if a page must be fetched: it was never crawled, or
+        either lastmod is unknown, or the sitemap lists a newer one.
+        """
+        if lastmod is None:
+            return True
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT lastmod FROM lastmod WHERE url = ?", (url,)
+            ).fetchone()
+        stored = parse_lastmod(row[0]) if row else None
+        return stored is None or lastmod > stored
+
+    def record(self, url, lastmod):
+        """Stores the lastmod of a page that was just crawled."""
+        if lastmod is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lastmod VALUES (?, ?)",
+                (url, lastmod.isoformat()),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,85 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawl_frontier import CrawlFrontier  # noqa: E402
+
+
+@pytest.fixture
+def frontier():
+    frontier = CrawlFrontier(memory_limit=2)
+    yield frontier
+    frontier.close()
+
+
+def drain(frontier):
+    entries = []
+    while True:
+        entry = frontier.pop()
+        if entry is None:
+            return entries
+        entries.append(entry)
+
+
+def test_fifo_order_across_the_spill(frontier):
+    urls = [f"http://example.test/{i}" for i in range(7)]
+    for i, url in enumerate(urls):
+        assert frontier.push(url, 1, f"1-{i}")
+
+    assert frontier._spilled > 0
+    assert len(frontier) == 7
+    assert [entry[0] for entry in drain(frontier)] == urls
+    assert len(frontier) == 0
+
+
+def test_fifo_order_with_pushes_between_pops(frontier):
+    pushed = []
+    popped = []
+    for i in range(10):
+        url = f"http://example.test/{i}"
+        frontier.push(url, 1, str(i))
+        pushed.append(url)
+        if i % 3 == 2:
+            popped.append(frontier.pop()[0])
+    popped += [entry[0] for entry in drain(frontier)]
+
+    assert popped == pushed
+
+
+def test_urls_are_queued_once_even_after_spilling(frontier):
+    for i in range(5):
+        frontier.push(f"http://example.test/{i}", 1, str(i))
+    drain(frontier)
+
+    # Seen URLs are remembered in memory and in the spill database
+    assert not frontier.push("http://example.test/0", 2, "x")
+    assert not frontier.push("http://example.test/4", 2, "y")
+    assert not frontier.mark_seen("http://example.test/3")
+    assert frontier.mark_seen("http://example.test/new")
+    assert frontier.pop() is None
+
+
+def test_max_per_depth():
+    frontier = CrawlFrontier(memory_limit=2, max_per_depth=2)
+    try:
+        pushed = [
+            frontier.push(f"http://example.test/{i}", 1, str(i)) for i in range(4)
+        ]
+        assert pushed == [True, True, False, False]
+        assert frontier.push("http://example.test/deeper", 2, "d")
+    finally:
+        frontier.close()
+
+
+def test_close_removes_the_temporary_spill_file():
+    frontier = CrawlFrontier(memory_limit=1)
+    for i in range(3):
+        frontier.push(f"http://example.test/{i}", 1, str(i))
+    path = frontier._spill_path
+    assert os.path.exists(path)
+
+    frontier.close()
+    assert not os.path.exists(path)
@@ -0,0 +1,52 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrapper  # noqa: E402
+from embedded_json import EmbeddedJSONExtractor  # noqa: E402
+
+ARTICLE = {
+    "headline": "Release notes",
+    "articleBody": "The new version ships faster crawls and smaller PDFs.",
+}
+
+
+def script(payload, attrs='type="application/json"'):
+    return f"<script {attrs}>{payload}</script>"
+
+
+@pytest.mark.parametrize("levels", [500, 5000])
+def test_deeply_nested_payload_only_loses_itself(levels):
+    deep = "[" * levels + "]" * levels
+    html = script(deep) + script(json.dumps(ARTICLE), 'type="application/ld+json"')
+
+    blocks, sources = EmbeddedJSONExtractor().extract(html)
+
+    assert sources == ["json-ld"]
+    assert [block["text"] for block in blocks] == [
+        "Release notes",
+        "The new version ships faster crawls and smaller PDFs.",
+    ]
+
+
+def test_deep_state_assignment_is_skipped():
+    deep = '{"a":' * 5000 + "1" + "}" * 5000
+    html = script(f"window.__INITIAL_STATE__ = {deep};", "")
+
+    assert EmbeddedJSONExtractor().extract(html) == ([], [])
+
+
+def test_page_keeps_markup_content_with_a_bad_payload(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scraper = scrapper.PDFWebScraper(delay=0, respect_robots=False)
+    deep = "[" * 5000 + "]" * 5000
+    html = f"<h1>Title</h1><p>Kept paragraph</p>{script(deep)}"
+
+    data = scraper._parse_page("http://example.test/", html.encode("utf-8"))
+
+    assert "error" not in data
+    assert "Kept paragraph" in data["paragraphs"]
@@ -0,0 +1,108 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from link_filter import BloomFilter, LinkFilter, SeenIndex  # noqa: E402
+
+PAGE = "http://example.test/a"
+
+
+def urls(n, prefix="http://example.test/p"):
+    return [f"{prefix}{i}" for i in range(n)]
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    added = urls(2000)
+    for url in added:
+        bloom.add(url)
+
+    assert all(url in bloom for url in added)
+    # add() reports a false positive as already present
+    assert 1900 <= len(bloom) <= 2000
+    assert not bloom.add(added[0])
+
+
+def test_bloom_filter_false_positive_rate():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    for url in urls(2000):
+        bloom.add(url)
+
+    false_positives = sum(url in bloom for url in urls(10000, "http://other.test/"))
+    assert false_positives / 10000 < 0.03
+
+
+@pytest.mark.parametrize("bloom_capacity", [None, 1000])
+def test_seen_index_claim_and_seen(bloom_capacity):
+    index = SeenIndex(bloom_capacity=bloom_capacity)
+    url = "http://example.test/x"
+
+    assert not index.seen(url)
+    assert index.claim(url)
+    # Queued, not visited: seen() but not `in`
+    assert index.seen(url) and url not in index
+    assert not index.claim(url)
+
+    index.add(url)
+    assert url in index and len(index) == 1
+    assert not index.claim(url)
+
+    index.update(["http://example.test/y"])
+    assert not index.claim("http://example.test/y")
+    assert len(index) == 2
+
+    index.clear()
+    assert not index.seen(url) and len(index) == 0
+    assert index.claim(url)
+
+
+def test_select_canonical_same_domain_children():
+    links = [
+        "http://example.test/b#top",
+        "http://example.test/b",
+        "http://other.test/c",
+        "mailto:someone@example.test",
+        "http://example.test/c",
+    ]
+    assert LinkFilter().select(PAGE, links) == [
+        "http://example.test/b",
+        "http://example.test/c",
+    ]
+
+
+def test_select_skips_seen_and_queued_urls():
+    visited = SeenIndex()
+    visited.add("http://example.test/b")
+    visited.claim("http://example.test/c")
+    links = urls(2, "http://example.test/") + ["http://example.test/b"]
+    links += ["http://example.test/c", "http://example.test/d"]
+
+    assert LinkFilter().select(PAGE, links, visited) == [
+        "http://example.test/0",
+        "http://example.test/1",
+        "http://example.test/d",
+    ]
+
+
+def test_select_patterns_robots_and_cap():
+    link_filter = LinkFilter(allow=r"/docs/", deny=r"\.pdf$", max_per_page=2)
+    links = [
+        "http://example.test/blog/1",
+        "http://example.test/docs/a.pdf",
+        "http://example.test/docs/private/b",
+        "http://example.test/docs/c",
+        "http://example.test/docs/d",
+        "http://example.test/docs/e",
+    ]
+
+    def can_fetch(url):
+        return "/private/" not in url
+
+    # Blocked links do not count towards max_per_page
+    assert link_filter.select(PAGE, links, can_fetch=can_fetch) == [
+        "http://example.test/docs/c",
+        "http://example.test/docs/d",
+    ]
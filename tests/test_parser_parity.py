@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrapper  # noqa: E402
+
+pytestmark = pytest.mark.skipif(
+    scrapper.lxml_html is None, reason="lxml is not installed"
+)
+
+DOCUMENTS = [
+    "<html><head><title>T</title></head><body><h1>Title</h1><p>Text</p></body></html>",
+    "<p>c<script>var x = 1;</script>d</p>",
+    "<p>a<style>p { color: red }</style>b<template><p>t</p></template>c</p>",
+    "<h2>Head<!-- note -->ing</h2><p> spaced <b>bold</b> tail </p>",
+    '<a href="/x">Link<script>track()</script></a><a>no href</a><a href="">empty</a>',
+    "<div><section><p>outer <em>inner</em></p></section><h3><span>a</span> b</h3></div>",
+    "<p>caf&eacute; &amp; t&eacute;</p><script>document.write('<p>fake</p>')</script>",
+]
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return scrapper.PDFWebScraper(delay=0, respect_robots=False)
+
+
+@pytest.mark.parametrize("html", DOCUMENTS)
+def test_lxml_walk_matches_soup(scraper, html):
+    content = html.encode("utf-8")
+    assert scraper._walk_lxml(content) == scraper._walk_soup(content)
+
+
+def test_inline_script_text_is_skipped(scraper):
+    _, elements = scraper._walk_lxml(b"<p>c<script>var x=1</script>d</p>")
+    assert elements == [("p", "cd", None)]
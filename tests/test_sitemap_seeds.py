@@ -0,0 +1,85 @@
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrapper  # noqa: E402
+from sitemap import LastmodStore  # noqa: E402
+
+ROOT = "http://example.test/"
+LASTMOD = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class StaticSitemap:
+    """Sitemap reader listing a fixed set of pages."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def iter_pages(self, url):
+        for page in self.pages:
+            yield f"{ROOT}{page}", LASTMOD
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return scrapper.PDFWebScraper(delay=0, respect_robots=False)
+
+
+def seed_indexes(scraper, pages):
+    scraper.sitemaps = StaticSitemap(pages)
+    entries, _ = scraper._sitemap_entries("1", ROOT, max_depth=2)
+    return {url.rsplit("/", 1)[1]: index for index, url, _ in entries}
+
+
+def test_seed_names_survive_an_inserted_page(scraper):
+    before = seed_indexes(scraper, ["p5", "p6", "p7"])
+    after = seed_indexes(scraper, ["p4", "p5", "p6", "p7"])
+
+    assert {page: after[page] for page in before} == before
+    assert after["p4"] not in before.values()
+    assert len(set(after.values())) == 4
+
+
+def test_only_changed_run_does_not_reuse_a_name(scraper, tmp_path):
+    scraper.lastmods = LastmodStore(str(tmp_path / "lastmod.sqlite"))
+    try:
+        first = seed_indexes(scraper, ["p5", "p6", "p7"])
+        for page in first:
+            scraper.lastmods.record(f"{ROOT}{page}", LASTMOD)
+
+        second = seed_indexes(scraper, ["p4", "p5", "p6", "p7"])
+    finally:
+        scraper.lastmods.close()
+
+    assert list(second) == ["p4"]
+    assert second["p4"] not in first.values()
+
+
+def test_lastmod_is_recorded_only_after_the_pdf_is_written(
+    scraper, tmp_path, monkeypatch
+):
+    url = f"{ROOT}p5"
+    scraper.output_dir = str(tmp_path)
+    scraper.lastmods = LastmodStore(str(tmp_path / "lastmod.sqlite"))
+    data = scraper._parse_page(url, b"<h1>P5</h1><p>Body text</p>")
+    data["url"] = url
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    try:
+        scraper._seed_lastmods[url] = LASTMOD
+        with monkeypatch.context() as m:
+            m.setattr(scrapper.SimpleDocTemplate, "build", fail)
+            scraper.create_pdf(data, "web1-s.pdf")
+        assert scraper.lastmods.changed(url, LASTMOD)
+
+        scraper.create_pdf(data, "web1-s.pdf")
+        assert not scraper.lastmods.changed(url, LASTMOD)
+    finally:
+        scraper.lastmods.close()
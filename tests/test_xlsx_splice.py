@@ -0,0 +1,83 @@
+import io
+import os
+import sys
+import zipfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+pytest.importorskip("xlwt")
+
+import fixtures  # noqa: E402
+import xlsx_processor  # noqa: E402
+from openpyxl import Workbook, load_workbook  # noqa: E402
+
+
+@pytest.fixture
+def xls_content(tmp_path):
+    path = tmp_path / "book.xls"
+    fixtures.make_xls(str(path), sheets=3, rows=60, cols=8)
+    return path.read_bytes()
+
+
+def dump(content):
+    """Sheet names, cell values, number formats and merged ranges."""
+    workbook = load_workbook(io.BytesIO(content))
+    return [
+        (
+            sheet.title,
+            [[(c.value, c.number_format) for c in row] for row in sheet.iter_rows()],
+            sorted(str(r) for r in sheet.merged_cells.ranges),
+        )
+        for sheet in workbook.worksheets
+    ]
+
+
+def test_parallel_output_matches_sequential(xls_content, capsys):
+    sequential = xlsx_processor.convert_xls_to_xlsx(xls_content)
+    parallel = xlsx_processor.convert_xls_to_xlsx(xls_content, workers=2)
+
+    assert dump(parallel) == dump(sequential)
+    # The sheets were spliced, not converted again sequentially
+    assert "secuencial" not in capsys.readouterr().out
+
+
+def test_falls_back_when_sheets_cannot_be_spliced(xls_content, monkeypatch, capsys):
+    monkeypatch.setattr(xlsx_processor, "_can_splice", lambda *args: False)
+    sequential = xlsx_processor.convert_xls_to_xlsx(xls_content)
+    parallel = xlsx_processor.convert_xls_to_xlsx(xls_content, workers=2)
+
+    assert dump(parallel) == dump(sequential)
+    assert "secuencial" in capsys.readouterr().out
+
+
+def save_book(path, formats):
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Hoja")
+    xlsx_processor._register_formats(worksheet, formats)
+    workbook.save(path)
+    return str(path)
+
+
+def test_can_splice_checks_part_names_and_styles(tmp_path):
+    skeleton = save_book(tmp_path / "skeleton.xlsx", ["0.00"])
+    same = save_book(tmp_path / "same.xlsx", ["0.00"])
+    other = save_book(tmp_path / "other.xlsx", ["0.00", "YYYY-MM-DD"])
+    part = "xl/worksheets/sheet1.xml"
+
+    assert xlsx_processor._can_splice(skeleton, {part: same})
+    assert not xlsx_processor._can_splice(skeleton, {part: other})
+    assert not xlsx_processor._can_splice(
+        skeleton, {part: same, "xl/worksheets/sheet2.xml": same}
+    )
+
+    # A worker book without its sheet in sheet1.xml
+    renamed = tmp_path / "renamed.xlsx"
+    with zipfile.ZipFile(same) as src, zipfile.ZipFile(renamed, "w") as dst:
+        for info in src.infolist():
+            name = info.filename.replace("sheet1.xml", "sheet9.xml")
+            dst.writestr(name, src.read(info))
+    assert not xlsx_processor._can_splice(skeleton, {part: str(renamed)})
@@ -1,98 +1,407 @@
+import datetime
+import io
 import os
+import re
 import tempfile
-import requests
 import shutil
-import pandas as pd
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import xlrd
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.worksheet.cell_range import CellRange
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pa_csv = None
+    pq = None
+
+import http_client
+from metrics import get_metrics
+
+# Versión del conversor: cambiarla invalida los XLSX guardados en caché
+CONVERTER_VERSION = "2"
+
+# Firmas de los primeros bytes: XLS (documento compuesto OLE2) y XLSX (ZIP)
+OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ZIP_MAGIC = b"PK\x03\x04"
+
+CHUNK_SIZE = 1024 * 1024
+
+# Formatos de exportación en columnas y su extensión
+EXPORT_FORMATS = {"parquet": "parquet", "csv": "csv", "arrow": "arrow"}
+
+
+def _xls_cell_value(cell, datemode, number_format):
+    """Convierte una celda de xlrd al valor equivalente para openpyxl."""
+    if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+        return None
+    if cell.ctype == xlrd.XL_CELL_BOOLEAN:
+        return bool(cell.value)
+    if cell.ctype == xlrd.XL_CELL_ERROR:
+        return xlrd.error_text_from_code.get(cell.value, "#N/A")
+    if cell.ctype == xlrd.XL_CELL_DATE:
+        try:
+            return xlrd.xldate_as_datetime(cell.value, datemode)
+        except (xlrd.xldate.XLDateError, ValueError, OverflowError):
+            return cell.value
+    if cell.ctype == xlrd.XL_CELL_NUMBER:
+        if number_format == "General" and cell.value.is_integer():
+            return int(cell.value)
+    return cell.value
+
+
+def _open_xls(xls_source):
+    """Abre un XLS (ruta o bytes) con xlrd cargando las hojas bajo demanda."""
+    if isinstance(xls_source, str):
+        source = {"filename": xls_source}
+    else:
+        source = {"file_contents": xls_source}
+    return xlrd.open_workbook(formatting_info=True, on_demand=True, **source)
+
+
+def _number_formats(book):
+    """
+    Devuelve el formato numérico de cada estilo (XF) del libro.
+
+    Returns:
+        list: Cadena de formato por índice de XF ("General" si no tiene)
+    """
+    formats = []
+    for xf in book.xf_list:
+        fmt = book.format_map.get(xf.format_key)
+        formats.append(fmt.format_str if fmt else "General")
+    return formats
+
+
+def _register_formats(worksheet, formats):
+    """
+    Registra en el libro de salida todos los formatos numéricos del XLS.
+
+    Al registrarlos siempre en el mismo orden, los identificadores de
+    estilo coinciden en cualquier libro creado a partir del mismo XLS, lo
+    que permite montar hojas convertidas por separado.
+    """
+    for fmt in sorted(set(formats) - {"General"}):
+        cell = WriteOnlyCell(worksheet)
+        cell.number_format = fmt
+        cell.style_id
+
+
+def _write_sheet(book, sheet_name, worksheet, formats):
+    """Copia una hoja del XLS a una hoja write_only y la descarga de memoria."""
+    sheet = book.sheet_by_name(sheet_name)
+
+    for row_index in range(sheet.nrows):
+        row = []
+        for cell in sheet.row(row_index):
+            fmt = formats[cell.xf_index]
+            value = _xls_cell_value(cell, book.datemode, fmt)
+            if fmt != "General" and value is not None:
+                # El formato antes que el valor: si no, openpyxl registra su
+                # formato de fecha por defecto y cambia styles.xml
+                cell = WriteOnlyCell(worksheet)
+                cell.number_format = fmt
+                cell.value = value
+                value = cell
+            row.append(value)
+        worksheet.append(row)
+
+    # Rangos combinados (xlrd usa índices 0 con fin exclusivo)
+    for row_lo, row_hi, col_lo, col_hi in sheet.merged_cells:
+        worksheet.merged_cells.add(
+            CellRange(
+                min_row=row_lo + 1,
+                max_row=row_hi,
+                min_col=col_lo + 1,
+                max_col=col_hi,
+            )
+        )
+
+    book.unload_sheet(sheet_name)
+
+
+def _convert_sheet_worker(xls_path, sheet_name, xlsx_path):
+    """Convierte una sola hoja a un XLSX propio (en un proceso del pool)."""
+    book = _open_xls(xls_path)
+    try:
+        formats = _number_formats(book)
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(sheet_name)
+        _register_formats(worksheet, formats)
+        _write_sheet(book, sheet_name, worksheet, formats)
+        workbook.save(xlsx_path)
+    finally:
+        book.release_resources()
 
 
-def convert_xls_to_xlsx(xls_content):
+def _can_splice(skeleton_path, sheet_parts):
+    """
+    Comprueba que las hojas convertidas por separado encajan en el esqueleto.
+
+    Args:
+        skeleton_path: XLSX esqueleto con las hojas vacías
+        sheet_parts: Parte de cada hoja en el esqueleto -> XLSX que la tiene
+
+    Returns:
+        bool: True si los nombres de parte y los estilos coinciden
+    """
+    with zipfile.ZipFile(skeleton_path) as skeleton:
+        names = {
+            name for name in skeleton.namelist() if name.startswith("xl/worksheets/")
+        }
+        if names != set(sheet_parts):
+            return False
+        styles = skeleton.read("xl/styles.xml")
+
+    for path in sheet_parts.values():
+        with zipfile.ZipFile(path) as part:
+            if "xl/worksheets/sheet1.xml" not in part.namelist():
+                return False
+            if part.read("xl/styles.xml") != styles:
+                return False
+    return True
+
+
+def _convert_sheets_parallel(book, xls_path, xlsx_output, workers):
+    """
+    Convierte cada hoja en un proceso distinto y las une en un solo XLSX.
+
+    Las hojas convertidas solo difieren del libro final en su XML de hoja:
+    las cadenas van en línea y los estilos se registran en el mismo orden
+    en todos los libros (ver _register_formats). Por eso basta con generar
+    un libro esqueleto con las hojas vacías y sustituir dentro del ZIP el
+    XML de cada hoja por el del proceso que la convirtió.
+
+    Antes de montar se comprueba que el esqueleto tiene exactamente las
+    partes xl/worksheets/sheetN.xml esperadas y que cada libro parcial
+    tiene su hoja en sheet1.xml y un styles.xml idéntico al del esqueleto;
+    si no, los identificadores de estilo no serían fiables.
+
+    Returns:
+        bool: False si el montaje no es seguro y no se escribió nada (hay
+            que convertir el libro de forma secuencial)
+    """
+    sheet_names = book.sheet_names()
+    formats = _number_formats(book)
+
+    with tempfile.TemporaryDirectory(prefix="xls_sheets_") as temp_dir:
+        sheet_paths = [
+            os.path.join(temp_dir, f"hoja{i}.xlsx") for i in range(len(sheet_names))
+        ]
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [
+                executor.submit(_convert_sheet_worker, xls_path, name, path)
+                for name, path in zip(sheet_names, sheet_paths)
+            ]
+            for future in futures:
+                future.result()
+
+        # Libro esqueleto con las hojas en el orden original
+        skeleton_path = os.path.join(temp_dir, "esqueleto.xlsx")
+        workbook = Workbook(write_only=True)
+        for name in sheet_names:
+            worksheet = workbook.create_sheet(name)
+            _register_formats(worksheet, formats)
+        workbook.save(skeleton_path)
+
+        sheet_parts = {
+            f"xl/worksheets/sheet{i}.xml": path for i, path in enumerate(sheet_paths, 1)
+        }
+        if not _can_splice(skeleton_path, sheet_parts):
+            return False
+
+        with zipfile.ZipFile(skeleton_path) as skeleton, zipfile.ZipFile(
+            xlsx_output, "w", zipfile.ZIP_DEFLATED
+        ) as output:
+            for info in skeleton.infolist():
+                if info.filename not in sheet_parts:
+                    output.writestr(info, skeleton.read(info))
+                    continue
+                with zipfile.ZipFile(sheet_parts[info.filename]) as part, part.open(
+                    "xl/worksheets/sheet1.xml"
+                ) as src, output.open(info.filename, "w") as dst:
+                    shutil.copyfileobj(src, dst, CHUNK_SIZE)
+    return True
+
+
+def convert_xls_file(xls_source, xlsx_output, workers=1):
+    """
+    Convierte un XLS a XLSX fila a fila, sin construir DataFrames.
+
+    Cada hoja se carga bajo demanda con xlrd y se libera al terminarla, y el
+    XLSX se escribe con openpyxl en modo write_only, que vuelca las filas a
+    disco según se añaden. Se conservan los tipos de celda (números,
+    texto, booleanos, errores), las fechas con su formato original, el
+    resto de formatos numéricos y los rangos combinados.
+
+    Args:
+        xls_source: Ruta, bytes o fichero binario del XLS
+        xlsx_output: Ruta o fichero binario donde escribir el XLSX
+        workers (int): Procesos para convertir hojas en paralelo. Con más
+            de uno, cada hoja se convierte en un proceso y se montan en el
+            orden original; útil en libros con muchas hojas grandes
+    """
+    if not isinstance(xls_source, (str, bytes, bytearray)):
+        xls_source = xls_source.read()
+
+    with get_metrics().time("xls_convert"):
+        book = _open_xls(xls_source)
+        try:
+            if workers > 1 and book.nsheets > 1:
+                if isinstance(xls_source, str):
+                    spliced = _convert_sheets_parallel(
+                        book, xls_source, xlsx_output, workers
+                    )
+                else:
+                    # Los procesos abren el XLS por su ruta: volcarlo a disco
+                    with tempfile.NamedTemporaryFile(suffix=".xls", delete=False) as f:
+                        f.write(xls_source)
+                    try:
+                        spliced = _convert_sheets_parallel(
+                            book, f.name, xlsx_output, workers
+                        )
+                    finally:
+                        os.remove(f.name)
+                if spliced:
+                    return
+                print("⚠️  Las hojas no se pueden montar; conversión secuencial")
+
+            formats = _number_formats(book)
+            workbook = Workbook(write_only=True)
+            for sheet_name in book.sheet_names():
+                worksheet = workbook.create_sheet(sheet_name)
+                _write_sheet(book, sheet_name, worksheet, formats)
+            workbook.save(xlsx_output)
+        finally:
+            book.release_resources()
+
+
+def convert_xls_to_xlsx(xls_content, workers=1):
     """
     Convierte contenido XLS a formato XLSX preservando toda la información.
 
     Args:
         xls_content (bytes): Contenido del archivo XLS en bytes
+        workers (int): Procesos para convertir hojas en paralelo
 
     Returns:
         bytes: Contenido del archivo convertido a XLSX
     """
-    import io
+    xlsx_buffer = io.BytesIO()
+    convert_xls_file(xls_content, xlsx_buffer, workers=workers)
+    return xlsx_buffer.getvalue()
 
-    # Leer el XLS desde bytes
-    xls_buffer = io.BytesIO(xls_content)
 
-    # Leer todas las hojas del archivo XLS
-    xls_file = pd.ExcelFile(xls_buffer, engine="xlrd")
+def _is_xls(head, filename, content_type):
+    """
+    Indica si un archivo descargado es XLS y necesita conversión.
 
-    # Crear buffer para el XLSX de salida
-    xlsx_buffer = io.BytesIO()
+    Se decide por la firma de los primeros bytes (OLE2 para XLS, ZIP para
+    XLSX); la extensión y el content-type solo se usan si no hay firma
+    reconocible.
+    """
+    if head.startswith(OLE2_MAGIC):
+        return True
+    if head.startswith(ZIP_MAGIC):
+        return False
+    if filename.lower().endswith(".xls") and not filename.lower().endswith(".xlsx"):
+        return True
+    # Intentar detectar por content-type si no es claro por la extensión
+    return "application/vnd.ms-excel" in content_type.lower()
 
-    # Escribir todas las hojas al nuevo archivo XLSX
-    with pd.ExcelWriter(xlsx_buffer, engine="openpyxl", mode="w") as writer:
-        for sheet_name in xls_file.sheet_names:
-            # Leer cada hoja preservando tipos de datos
-            df = pd.read_excel(xls_file, sheet_name=sheet_name, header=None)
 
-            # Escribir al nuevo archivo
-            df.to_excel(writer, sheet_name=sheet_name, index=False, header=False)
+def _xlsx_filename(filename):
+    """Nombre del archivo de salida, siempre con extensión .xlsx."""
+    if filename.lower().endswith(".xls"):
+        return filename[:-4] + ".xlsx"
+    if not filename.lower().endswith(".xlsx"):
+        return filename + ".xlsx"
+    return filename
 
-    # Obtener el contenido del XLSX
-    xlsx_buffer.seek(0)
-    return xlsx_buffer.read()
 
+def _download_to_file(url, session, path):
+    """
+    Descarga una URL por bloques a un archivo.
 
-def xlsx_url_to_temp_file(xlsx_url):
+    Returns:
+        tuple: (primeros bytes del archivo, content-type de la respuesta)
+    """
+    session = session or http_client.get_session()
+    with get_metrics().time("xlsx_download"), session.get(
+        url, stream=True, timeout=http_client.DEFAULT_TIMEOUT
+    ) as response:
+        response.raise_for_status()
+        with open(path, "wb") as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+        get_metrics().inc("bytes_fetched_total", http_client.wire_bytes(response))
+
+    with open(path, "rb") as f:
+        head = f.read(len(OLE2_MAGIC))
+    return head, response.headers.get("content-type", "")
+
+
+def xlsx_url_to_temp_file(xlsx_url, session=None, cache=None, workers=1):
     """
     Descarga un archivo Excel (XLSX o XLS) desde una URL y lo guarda como XLSX en un archivo temporal.
     Si el archivo es XLS, lo convierte a XLSX antes de guardarlo.
 
     Args:
         xlsx_url (str): URL del archivo Excel (.xlsx o .xls)
+        session (requests.Session, opcional): Sesión HTTP a usar. Por defecto
+            la sesión compartida con pool de conexiones de http_client
+        cache (ConversionCache, opcional): Caché de conversiones. Si el
+            archivo no ha cambiado se copia el XLSX guardado sin descargarlo
+            ni convertirlo de nuevo
+        workers (int): Procesos para convertir las hojas de un XLS en
+            paralelo (ver convert_xls_file)
 
     Returns:
         tuple: (ruta_archivo_temporal, directorio_temporal)
     """
-    # Descargar el archivo
-    response = requests.get(xlsx_url)
-    response.raise_for_status()
-
-    # Crear directorio temporal
-    temp_dir = tempfile.mkdtemp(prefix="xlsx_temp_")
-
     # Extraer nombre base del archivo
     filename = xlsx_url.split("/")[-1] if "/" in xlsx_url else "temp_file"
 
-    # Determinar si necesita conversión
-    is_xls = False
-    if filename.lower().endswith(".xls") and not filename.lower().endswith(".xlsx"):
-        is_xls = True
-    else:
-        # Intentar detectar por content-type si no es claro por la extensión
-        content_type = response.headers.get("content-type", "").lower()
-        if "application/vnd.ms-excel" in content_type:
-            is_xls = True
-
-    # Procesar el contenido
-    if is_xls:
-        # Convertir XLS a XLSX
-        content = convert_xls_to_xlsx(response.content)
-        # Asegurar que el nombre termine en .xlsx
-        if filename.lower().endswith(".xls"):
-            filename = filename[:-4] + ".xlsx"
+    # Crear directorio temporal y ruta completa
+    temp_dir = tempfile.mkdtemp(prefix="xlsx_temp_")
+    temp_file_path = os.path.join(temp_dir, _xlsx_filename(filename))
+
+    def convert(source, path, response):
+        # Convertir XLS a XLSX o copiar el XLSX directamente
+        head = source.read(len(OLE2_MAGIC))
+        source.seek(0)
+        if _is_xls(head, filename, response.headers.get("content-type", "")):
+            convert_xls_file(source, path, workers=workers)
         else:
-            filename = filename + ".xlsx"
-    else:
-        # Ya es XLSX, usar directamente
-        content = response.content
-        # Asegurar extensión .xlsx
-        if not filename.lower().endswith(".xlsx"):
-            filename = filename + ".xlsx"
-
-    # Crear ruta completa
-    temp_file_path = os.path.join(temp_dir, filename)
+            with open(path, "wb") as f:
+                shutil.copyfileobj(source, f)
 
-    # Guardar el archivo
-    with open(temp_file_path, "wb") as f:
-        f.write(content)
+    try:
+        if cache is not None:
+            with cache.open(
+                xlsx_url, "xlsx", CONVERTER_VERSION, convert, session=session
+            ) as cached, open(temp_file_path, "wb") as f:
+                shutil.copyfileobj(cached, f)
+        else:
+            # Descargar el archivo por bloques directamente al directorio temporal
+            download_path = os.path.join(temp_dir, ".descarga")
+            head, content_type = _download_to_file(xlsx_url, session, download_path)
+
+            # Solo el XLS necesita una pasada de conversión; el XLSX se renombra
+            if _is_xls(head, filename, content_type):
+                convert_xls_file(download_path, temp_file_path, workers=workers)
+                os.remove(download_path)
+            else:
+                os.replace(download_path, temp_file_path)
+    except Exception:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
 
     return temp_file_path, temp_dir
 
@@ -115,6 +424,203 @@ def cleanup_temp_files(temp_dir):
         return False
 
 
+def _iter_sheet_rows(path, is_xls):
+    """
+    Recorre las hojas de un XLS o XLSX sin convertirlo.
+
+    Yields:
+        tuple: (nombre_hoja, generador de filas como tuplas de valores)
+    """
+    if is_xls:
+        book = _open_xls(path)
+        try:
+            formats = _number_formats(book)
+            for sheet_name in book.sheet_names():
+                sheet = book.sheet_by_name(sheet_name)
+                rows = (
+                    tuple(
+                        _xls_cell_value(cell, book.datemode, formats[cell.xf_index])
+                        for cell in sheet.row(row_index)
+                    )
+                    for row_index in range(sheet.nrows)
+                )
+                yield sheet_name, rows
+                book.unload_sheet(sheet_name)
+        finally:
+            book.release_resources()
+    else:
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            for worksheet in workbook.worksheets:
+                yield worksheet.title, worksheet.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+
+
+def _column_array(values):
+    """
+    Crea la columna Arrow infiriendo el tipo a partir de los valores.
+
+    Booleanos, enteros, decimales y fechas conservan su tipo si toda la
+    columna lo comparte (los enteros mezclados con decimales pasan a
+    float64); cualquier otra mezcla se guarda como texto.
+    """
+    kinds = {type(v) for v in values if v is not None}
+    if kinds == {bool}:
+        return pa.array(values, type=pa.bool_())
+    if kinds == {int}:
+        return pa.array(values, type=pa.int64())
+    if kinds and kinds <= {int, float}:
+        return pa.array(values, type=pa.float64())
+    if kinds == {datetime.datetime}:
+        return pa.array(values, type=pa.timestamp("us"))
+    if kinds == {datetime.time}:
+        return pa.array(values, type=pa.time64("us"))
+    return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+
+
+def _is_header(rows):
+    """Detecta si la primera fila es una cabecera: todo texto sobre datos."""
+    first = [v for v in rows[0] if v is not None]
+    if not first or not all(isinstance(v, str) for v in first):
+        return False
+    # Una sola fila de texto no basta para distinguir cabecera de datos
+    return any(
+        v is not None and not isinstance(v, str) for row in rows[1:] for v in row
+    )
+
+
+def _sheet_table(rows, header):
+    """Construye la tabla Arrow de una hoja a partir de sus filas."""
+    rows = list(rows)
+    while rows and all(v is None for v in rows[-1]):
+        rows.pop()
+    width = max((len(row) for row in rows), default=0)
+    rows = [tuple(row) + (None,) * (width - len(row)) for row in rows]
+
+    if header == "auto":
+        header = bool(rows) and _is_header(rows)
+
+    names = [f"col_{i + 1}" for i in range(width)]
+    if header and rows:
+        seen = set()
+        for i, value in enumerate(rows.pop(0)):
+            name = str(value).strip() if value is not None else ""
+            name = name or names[i]
+            # Evitar nombres de columna repetidos
+            base, n = name, 1
+            while name in seen:
+                n += 1
+                name = f"{base}_{n}"
+            seen.add(name)
+            names[i] = name
+
+    columns = [_column_array([row[i] for row in rows]) for i in range(width)]
+    return pa.table(columns, names=names)
+
+
+def iter_sheet_tables(excel_path, header="auto"):
+    """
+    Lee cada hoja de un XLS o XLSX directamente como tabla Arrow.
+
+    No pasa por un XLSX intermedio ni por pandas: el XLS se lee con xlrd y
+    el XLSX con openpyxl en modo read_only. El formato se detecta por la
+    firma del archivo.
+
+    Args:
+        excel_path (str): Ruta del archivo XLS o XLSX
+        header: True si la primera fila es la cabecera, False si no la hay
+            o "auto" para detectarlo (primera fila de texto sobre datos)
+
+    Yields:
+        tuple: (nombre_hoja, pyarrow.Table)
+    """
+    if pa is None:
+        raise ImportError("pyarrow es necesario para la exportación en columnas")
+
+    with open(excel_path, "rb") as f:
+        head = f.read(len(OLE2_MAGIC))
+    is_xls = _is_xls(head, excel_path, "")
+
+    for sheet_name, rows in _iter_sheet_rows(excel_path, is_xls):
+        yield sheet_name, _sheet_table(rows, header)
+
+
+def _unique_name(name, used):
+    """
+    Añade un sufijo numérico (_2, _3...) si el nombre ya se usó.
+
+    "Hoja 1" y "Hoja_1" se sanean igual; sin sufijo la segunda hoja
+    sobrescribiría el archivo de la primera. La comparación ignora
+    mayúsculas por los sistemas de archivos que no las distinguen.
+    """
+    candidate = name
+    n = 1
+    while candidate.lower() in used:
+        n += 1
+        candidate = f"{name}_{n}"
+    used.add(candidate.lower())
+    return candidate
+
+
+def export_sheets(excel_path, output_dir, fmt="parquet", header="auto"):
+    """
+    Exporta cada hoja de un XLS o XLSX a un archivo Parquet, CSV o Arrow.
+
+    Args:
+        excel_path (str): Ruta del archivo XLS o XLSX
+        output_dir (str): Directorio donde escribir los archivos
+        fmt (str): "parquet", "csv" o "arrow" (formato IPC de Arrow)
+        header: Ver iter_sheet_tables
+
+    Returns:
+        dict: Nombre de hoja -> ruta del archivo generado, en orden
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato no soportado: {fmt}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    used = set()
+    for sheet_name, table in iter_sheet_tables(excel_path, header):
+        safe_name = _unique_name(
+            re.sub(r"[^\w.-]+", "_", sheet_name).strip("_") or "hoja", used
+        )
+        path = os.path.join(output_dir, f"{safe_name}.{EXPORT_FORMATS[fmt]}")
+        if fmt == "parquet":
+            pq.write_table(table, path)
+        elif fmt == "csv":
+            pa_csv.write_csv(table, path)
+        else:
+            with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(
+                sink, table.schema
+            ) as writer:
+                writer.write_table(table)
+        paths[sheet_name] = path
+    return paths
+
+
+def xlsx_url_to_tables(xlsx_url, session=None, header="auto"):
+    """
+    Descarga un Excel (XLS o XLSX) y devuelve sus hojas como tablas Arrow.
+
+    Para quien solo necesita los datos: evita convertir a XLSX y volver a
+    leerlo con pandas.
+
+    Args:
+        xlsx_url (str): URL del archivo Excel
+        session (requests.Session, opcional): Sesión HTTP a usar
+        header: Ver iter_sheet_tables
+
+    Returns:
+        dict: Nombre de hoja -> pyarrow.Table, en el orden del libro
+    """
+    with tempfile.TemporaryDirectory(prefix="xlsx_temp_") as temp_dir:
+        path = os.path.join(temp_dir, xlsx_url.split("/")[-1] or "descarga")
+        _download_to_file(xlsx_url, session, path)
+        return dict(iter_sheet_tables(path, header))
+
+
 # Ejemplo de uso
 if __name__ == "__main__":
     # Ejemplos de URLs - ambos se guardarán como XLSX